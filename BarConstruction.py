@@ -1,68 +1,284 @@
+import copy
+import os
+from collections.abc import Sequence
+
 import numpy as np
 
+from Instrumentation import instrumentation
+from PiecewiseResults import PiecewiseResults, bar_extremes, chain_loads
+
+
+class ChainFactorization:
+    # The tridiagonal matrix of a chain factors as D^T * diag(EA/L) * D with the bidiagonal difference
+    # operator D, so both triangular sweeps reduce to cumulative sums over the bars. The factorization
+    # depends only on the stiffnesses and terminations and is reused for every right-hand side.
+    def __init__(self, stiffness: np.ndarray, terminations: dict):
+        if not terminations["left"] and not terminations["right"]:
+            raise np.linalg.LinAlgError("Singular matrix")
+        self.terminations = dict(terminations)
+        self.flexibility = 1 / np.asarray(stiffness, dtype=float)
+        self.total_flexibility = np.sum(self.flexibility, axis=0)
+
+    def update(self, n_bar: int, stiffness: float):
+        # A single bar stiffness change only touches its own flexibility; the total is summed again rather than
+        # adjusted, so repeated edits never accumulate rounding drift
+        self.flexibility[n_bar] = 1 / stiffness
+        self.total_flexibility = np.sum(self.flexibility, axis=0)
+
+    def solve(self, loads: np.ndarray) -> np.ndarray:
+        # Extra trailing dimensions of loads are solved as independent right-hand sides
+        loads = np.asarray(loads, dtype=float)
+        flexibility = self.flexibility.reshape(self.flexibility.shape + (1,) * (loads.ndim - self.flexibility.ndim))
+        movements = np.zeros(loads.shape)
+
+        if self.terminations["left"] and self.terminations["right"]:
+            # Bar forces are known up to the left reaction, which closes the chain: sum(N / k) = 0
+            partial_loads = np.concatenate((np.zeros((1,) + loads.shape[1:]), np.cumsum(loads[1:-1], axis=0)))
+            total_flexibility = np.reshape(self.total_flexibility, np.shape(self.total_flexibility) +
+                                           (1,) * (loads.ndim - self.flexibility.ndim))
+            reaction = np.sum(partial_loads * flexibility, axis=0) / total_flexibility
+            bar_forces = reaction - partial_loads
+            movements[1:] = np.cumsum(bar_forces * flexibility, axis=0)
+            movements[-1] = 0
+        elif self.terminations["left"]:
+            bar_forces = np.cumsum(loads[:0:-1], axis=0)[::-1]
+            movements[1:] = np.cumsum(bar_forces * flexibility, axis=0)
+        else:
+            bar_forces = -np.cumsum(loads[:-1], axis=0)
+            movements[:-1] = -np.cumsum((bar_forces * flexibility)[::-1], axis=0)[::-1]
+        return movements
+
+
+class BarsView(Sequence):
+    def __init__(self, construction):
+        self._construction = construction
+
+    def __len__(self) -> int:
+        return self._construction.bars_count
+
+    def __getitem__(self, n_bar: int) -> dict:
+        if n_bar < 0:
+            n_bar += len(self)
+        if not 0 <= n_bar < len(self):
+            raise IndexError("bar index out of range")
+        return {name: float(self._construction.column(name)[n_bar]) for name in BarConstruction.property_names}
+
 
 class BarConstruction:
+    property_names = ('E', 'L', 'A', 'S', 'q')
+
     def __init__(self):
-        self.bars = []
-        self.forces = []
+        self.bars_count = 0
+        self._columns = {name: np.zeros(16) for name in self.property_names}
+        self._forces = np.zeros(17)
+        self._coordinates = np.zeros(17)
+        self.bars = BarsView(self)
         self.terminations = {"left": True, "right": True}
         self.movements_vector = None
+        self.results = None
         self.computed = False
+        self._factorization = None
+        self.load_cases = {}
+        self.load_case_movements = None
+
+    @classmethod
+    def from_arrays(cls, columns: dict, forces: np.ndarray, terminations: dict, coordinates: np.ndarray = None):
+        # Adopts the arrays without copying them, so memory-mapped columns stay on disk until they grow
+        construction = cls()
+        construction.bars_count = len(columns['L'])
+        construction._columns = {name: columns[name] for name in cls.property_names}
+        construction._forces = forces
+        if coordinates is None or construction.bars_count == 0:
+            # Node 0 sits at the origin even without bars, as after __init__
+            coordinates = np.concatenate(([0], np.cumsum(columns['L'])))
+        construction._coordinates = coordinates
+        construction.terminations = dict(terminations)
+        return construction
+
+    def unmap(self, filename: str):
+        # Reads the arrays memory-mapped from filename into memory, so the file can be replaced or deleted
+        def unmapped(values: np.ndarray) -> np.ndarray:
+            mapped = isinstance(values, np.memmap) and values.filename is not None and os.path.exists(filename)
+            return np.array(values) if mapped and os.path.samefile(values.filename, filename) else values
+
+        self._columns = {name: unmapped(values) for name, values in self._columns.items()}
+        self._forces = unmapped(self._forces)
+        self._coordinates = unmapped(self._coordinates)
+
+    def copy(self) -> 'BarConstruction':
+        # An independent copy with the current solution, which can be solved while this one is edited
+        construction = BarConstruction.from_arrays({name: self.column(name).copy() for name in self.property_names},
+                                                   self.forces.copy(), self.terminations, self.node_coordinates.copy())
+        construction.movements_vector = self.movements_vector
+        construction.results = self.results
+        construction.computed = self.computed
+        construction._factorization = copy.deepcopy(self._factorization)
+        return construction
+
+    def take_solution(self, construction: 'BarConstruction'):
+        # Adopts the solution of a copy, which is only valid while this construction has not been edited since
+        self.movements_vector = construction.movements_vector
+        self.results = construction.results
+        self.computed = construction.computed
+        self._factorization = construction._factorization
+
+    @property
+    def nodes_count(self) -> int:
+        return self.bars_count + 1 if self.bars_count else 0
+
+    @property
+    def forces(self) -> np.ndarray:
+        return self._forces[:self.nodes_count]
+
+    @forces.setter
+    def forces(self, forces):
+        forces = np.asarray(forces, dtype=float)
+        if len(forces) != self.nodes_count:
+            raise ValueError(f"Expected {self.nodes_count} nodal forces, got {len(forces)}")
+        self._forces[:self.nodes_count] = forces
+        self.computed = False
+
+    @property
+    def node_coordinates(self) -> np.ndarray:
+        return self._coordinates[:self.nodes_count]
+
+    @property
+    def total_length(self) -> float:
+        return float(self._coordinates[self.bars_count])
+
+    def column(self, name: str) -> np.ndarray:
+        return self._columns[name][:self.bars_count]
+
+    @property
+    def E(self) -> np.ndarray:
+        return self.column('E')
+
+    @property
+    def L(self) -> np.ndarray:
+        return self.column('L')
+
+    @property
+    def A(self) -> np.ndarray:
+        return self.column('A')
+
+    @property
+    def S(self) -> np.ndarray:
+        return self.column('S')
+
+    @property
+    def q(self) -> np.ndarray:
+        return self.column('q')
+
+    def _reserve(self, bars_count: int):
+        capacity = len(self._forces) - 1
+        if bars_count <= capacity:
+            return
+        capacity = max(bars_count, 2 * capacity)
+        for name, values in self._columns.items():
+            self._columns[name] = np.zeros(capacity)
+            self._columns[name][:self.bars_count] = values[:self.bars_count]
+        for name in ('_forces', '_coordinates'):
+            values = getattr(self, name)
+            setattr(self, name, np.zeros(capacity + 1))
+            getattr(self, name)[:self.nodes_count] = values[:self.nodes_count]
 
     def add_bar(self, properties: dict):
-        self.bars.append(properties)
-        if len(self.bars) == 1:
-            self.forces.extend([0, 0])
+        self._reserve(self.bars_count + 1)
+        for name in self.property_names:
+            self._columns[name][self.bars_count] = properties[name]
+        if self.bars_count == 0:
+            self._forces[:2] = 0
+            self._coordinates[:2] = 0, properties['L']
         else:
-            self.forces.append(0)
+            self._forces[self.nodes_count] = 0
+            self._coordinates[self.nodes_count] = self._coordinates[self.bars_count] + properties['L']
+        self.bars_count += 1
         self.computed = False
+        self._factorization = None
+        self.load_case_movements = None
 
     def del_bar(self):
-        if self.bars:
-            self.bars.pop()
-            if len(self.bars) > 0:
-                self.forces.pop()
-            else:
-                self.forces.clear()
+        if self.bars_count:
+            self.bars_count -= 1
             self.computed = False
+            self._factorization = None
+            self.load_case_movements = None
+
+    def clear(self):
+        self.bars_count = 0
+        self.computed = False
+        self._factorization = None
+        self.load_case_movements = None
+
+    def change_bar_property(self, n_bar: int, name: str, value: float):
+        self.column(name)[n_bar] = value
+        if name == 'L':
+            coordinates = self.node_coordinates
+            coordinates[n_bar + 1:] = coordinates[n_bar] + np.cumsum(self.L[n_bar:])
+        self.computed = False
+        if name in ('E', 'L', 'A'):
+            self.load_case_movements = None
+            if self._factorization is not None:
+                self._factorization.update(n_bar, self.E[n_bar] * self.A[n_bar] / self.L[n_bar])
 
     def change_force(self, node: int, force: float):
-        if self.bars:
+        if self.bars_count:
             self.forces[node - 1] = force
             self.computed = False
 
     def change_terminations(self, terminations: dict):
+        if terminations != self.terminations:
+            self._factorization = None
+            self.load_case_movements = None
         self.terminations = terminations
         self.computed = False
 
-    def compute_movements_vector(self):
+    @property
+    def factorization(self) -> ChainFactorization:
+        if self._factorization is None:
+            self._factorization = ChainFactorization(self.E * self.A / self.L, self.terminations)
+        return self._factorization
+
+    def compute_movements_vector(self, method: str = "banded"):
         if self.computed:
             return
 
-        E = np.array([properties['E'] for properties in self.bars])
-        L = np.array([properties['L'] for properties in self.bars])
-        A = np.array([properties['A'] for properties in self.bars])
-        F = np.array(self.forces)
-        q = np.array([properties['q'] for properties in self.bars])
-        nodes_count = len(self.bars) + 1
-        reactions_matrix = np.zeros((nodes_count, nodes_count))
-        reactions_vector = np.zeros((nodes_count, 1))
+        if method == "dense":
+            with instrumentation.timer("solve"):
+                self.movements_vector = self._solve_dense()
+        else:
+            with instrumentation.timer("assembly"):
+                loads = self.nodal_loads()
+            if self._factorization is not None:
+                instrumentation.count("factorizations_reused")
+            with instrumentation.timer("factorization"):
+                factorization = self.factorization
+            with instrumentation.timer("solve"):
+                self.movements_vector = factorization.solve(loads).reshape(-1, 1)
+        with instrumentation.timer("compilation"):
+            self.results = PiecewiseResults.from_solution(self.E, self.L, self.A, self.q, self.movements_vector[:, 0],
+                                                          self.node_coordinates)
+        instrumentation.count("solves")
+        self.computed = True
 
-        for i in range(nodes_count - 1):
-            for j in range(i, i + 2):
-                for k in range(i, i + 2):
-                    if j != k:
-                        reactions_matrix[j, k] -= E[i] * A[i] / L[i]
-                    else:
-                        reactions_matrix[j, k] += E[i] * A[i] / L[i]
+    def nodal_loads(self, forces: np.ndarray = None, q: np.ndarray = None) -> np.ndarray:
+        forces = self.forces if forces is None else forces
+        q = self.q if q is None else q
+        return chain_loads(self.L.reshape(self.L.shape + (1,) * (np.ndim(q) - 1)), q, forces)
 
-        for i in range(nodes_count):
-            reactions_vector[i] = F[i]
+    def _assemble_chain(self) -> tuple:
+        return self.E * self.A / self.L, self.nodal_loads()
 
-        for i in range(nodes_count - 1):
-            L = np.array([properties['L'] for properties in self.bars])
-            reactions_vector[i] += q[i] * L[i] / 2
-            reactions_vector[i + 1] += q[i] * L[i] / 2
+    def _solve_dense(self) -> np.ndarray:
+        stiffness, loads = self._assemble_chain()
+        nodes_count = len(stiffness) + 1
+        nodes = np.arange(nodes_count - 1)
+        reactions_matrix = np.zeros((nodes_count, nodes_count))
+        np.add.at(reactions_matrix, (nodes, nodes), stiffness)
+        np.add.at(reactions_matrix, (nodes + 1, nodes + 1), stiffness)
+        reactions_matrix[nodes, nodes + 1] = -stiffness
+        reactions_matrix[nodes + 1, nodes] = -stiffness
+        reactions_vector = loads.reshape(-1, 1)
 
         if self.terminations["left"]:
             reactions_matrix[0, 1:] = 0
@@ -73,33 +289,101 @@ class BarConstruction:
             reactions_matrix.transpose()[-1, :-1] = 0
             reactions_vector[-1] = 0
 
-        self.movements_vector = np.linalg.solve(reactions_matrix, reactions_vector)
-        print("Вектор перемещений:\n", self.movements_vector, '\n')
-        self.computed = True
+        return np.linalg.solve(reactions_matrix, reactions_vector)
 
-    def compute_Nx(self, n_bar: int, x: float) -> float:
-        E = np.array([properties['E'] for properties in self.bars])[n_bar]
-        L = np.array([properties['L'] for properties in self.bars])[n_bar]
-        A = np.array([properties['A'] for properties in self.bars])[n_bar]
-        q = np.array([properties['q'] for properties in self.bars])[n_bar]
-        U = self.movements_vector
+    def add_load_case(self, name: str, forces=None, q=None):
+        forces = np.array(self.forces if forces is None else forces, dtype=float)
+        q = np.array(self.q if q is None else q, dtype=float)
+        if len(forces) != self.nodes_count or len(q) != self.bars_count:
+            raise ValueError(f"Load case '{name}' must have {self.nodes_count} nodal forces "
+                             f"and {self.bars_count} distributed loads")
+        self.load_cases[name] = {'forces': forces, 'q': q}
+        self.load_case_movements = None
 
-        Nx = (E * A / L) * (U[n_bar + 1] - U[n_bar]) + (q * L / 2) * (1 - 2 * x / L)
-        return np.round(Nx[0], 4)
+    def del_load_case(self, name: str):
+        self.load_cases.pop(name)
+        self.load_case_movements = None
 
-    def compute_Ux(self, n_bar: int, x: float) -> float:
-        E = np.array([properties['E'] for properties in self.bars])[n_bar]
-        L = np.array([properties['L'] for properties in self.bars])[n_bar]
-        A = np.array([properties['A'] for properties in self.bars])[n_bar]
-        q = np.array([properties['q'] for properties in self.bars])[n_bar]
-        U = self.movements_vector
+    def compute_load_cases(self) -> dict:
+        for name, case in self.load_cases.items():
+            if len(case['forces']) != self.nodes_count or len(case['q']) != self.bars_count:
+                raise ValueError(f"Load case '{name}' does not match the construction")
 
-        Ux = U[n_bar] + (x / L) * (U[n_bar + 1] - U[n_bar]) + ((q * L ** 2 * x) / (2 * E * A * L)) * (1 - x / L)
-        return np.round(Ux[0], 4)
+        forces = np.column_stack([case['forces'] for case in self.load_cases.values()])
+        q = np.column_stack([case['q'] for case in self.load_cases.values()])
+        self.load_case_movements = self.factorization.solve(self.nodal_loads(forces, q))
+        return dict(zip(self.load_cases, self.load_case_movements.T))
 
-    def compute_Sx(self, n_bar: int, x: float) -> float:
-        Nx = self.compute_Nx(n_bar, x)
-        A = np.array([properties['A'] for properties in self.bars])[n_bar]
+    def compute_envelope(self) -> dict:
+        # Exact extrema of every load case along a trailing case axis, then their envelope over the cases
+        if self.load_case_movements is None:
+            self.compute_load_cases()
+
+        E, L, A = (column.reshape(-1, 1) for column in (self.E, self.L, self.A))
+        q = np.column_stack([case['q'] for case in self.load_cases.values()])
+        extremes = bar_extremes(E, L, A, q, self.load_case_movements)
 
-        Sx = Nx / A
-        return np.round(Sx, 4)
+        envelope = {}
+        for name, values in extremes.items():
+            envelope[name] = values.min(axis=1) if name.endswith('_min') else values.max(axis=1)
+        return envelope
+
+    def compute_fields(self, n_bars, x) -> tuple:
+        Nx, Ux, Sx = self.results.evaluate(n_bars, x)
+        return np.round(Nx, 4), np.round(Ux, 4), np.round(Sx, 4)
+
+    def discrete_positions(self, values_count: int = 10) -> tuple:
+        n_bars = np.repeat(np.arange(self.bars_count), values_count + 1)
+        step = self.L / values_count
+        x = np.tile(np.arange(values_count + 1), self.bars_count) * step[n_bars]
+        return n_bars, x
+
+    def end_positions(self) -> tuple:
+        n_bars = np.repeat(np.arange(self.bars_count), 2)
+        x = np.column_stack((np.zeros(self.bars_count), self.L)).ravel()
+        return n_bars, x
+
+    def extreme_positions(self) -> tuple:
+        # N and S are linear, so with both ends and the interior vertex of U every extremum of a bar is exact
+        vertices, inside = self.results.vertices()
+        x = np.column_stack((np.zeros(self.bars_count), vertices, self.results.lengths))
+        mask = np.column_stack((np.ones(self.bars_count, dtype=bool), inside, np.ones(self.bars_count, dtype=bool)))
+        return np.nonzero(mask)[0], x[mask]
+
+    def epure_positions(self, relative_tolerance: float = 1e-3, max_segments: int = 100) -> tuple:
+        # A chord of the parabola U(x) = ... + c x^2 over h deviates from it by |c| h^2 / 4, so each bar is split into
+        # just enough segments to stay within a fraction of the whole U range, and its interior vertex is added
+        results = self.results
+        extremes = results.extremes()
+        tolerance = relative_tolerance * (extremes['U_max'].max() - extremes['U_min'].min())
+        curvature = np.abs(results.coefficients[1, 2])
+        L = results.lengths
+        segments = np.ceil(L * np.sqrt(curvature / (4 * tolerance))) if tolerance > 0 else np.ones(self.bars_count)
+        segments = np.clip(segments, 1, max_segments).astype(int)
+
+        n_bars = np.repeat(np.arange(self.bars_count), segments + 1)
+        starts = np.cumsum(segments + 1) - (segments + 1)
+        x = (np.arange(len(n_bars)) - starts[n_bars]) * (L / segments)[n_bars]
+
+        vertices, inside = results.vertices()
+        n_bars = np.concatenate((n_bars, np.flatnonzero(inside)))
+        x = np.concatenate((x, vertices[inside]))
+        order = np.lexsort((x, n_bars))
+        return n_bars[order], x[order]
+
+    def discrete_values(self, values_count: int = 10) -> tuple:
+        n_bars, x = self.discrete_positions(values_count)
+        return (n_bars, x) + self.compute_fields(n_bars, x)
+
+    def extreme_values(self) -> tuple:
+        n_bars, x = self.extreme_positions()
+        return (n_bars, x) + self.compute_fields(n_bars, x)
+
+    def compute_Nx(self, n_bar: int, x: float) -> float:
+        return self.compute_fields(n_bar, x)[0]
+
+    def compute_Ux(self, n_bar: int, x: float) -> float:
+        return self.compute_fields(n_bar, x)[1]
+
+    def compute_Sx(self, n_bar: int, x: float) -> float:
+        return self.compute_fields(n_bar, x)[2]
@@ -0,0 +1,109 @@
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, Qt, pyqtSignal
+from PyQt5.QtGui import QBrush, QColor
+
+from BarConstruction import BarConstruction
+from Colors import Color
+
+bar_properties_error = "Параметры стержня должны быть положительными вещественными числами!\n" \
+                       "Распределенная нагрузка q должна быть вещественным числом!"
+
+
+class BarsTableModel(QAbstractTableModel):
+    # Bar rows read straight from the construction columns; the last row holds the properties of the next bar
+    bar_changed = pyqtSignal(int)
+    error_occurred = pyqtSignal(str)
+    default_properties = ["1", "1", "1", "1", "0"]
+
+    def __init__(self, construction: BarConstruction, parent=None):
+        super().__init__(parent)
+        self.construction = construction
+        self.new_bar = list(self.default_properties)
+        self.new_bar_brush = QBrush(QColor(*Color.light_yellow))
+
+    def set_construction(self, construction: BarConstruction):
+        self.beginResetModel()
+        self.construction = construction
+        self.new_bar = list(self.default_properties)
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else self.construction.bars_count + 1
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(BarConstruction.property_names)
+
+    def is_new_bar_row(self, row: int) -> bool:
+        return row == self.construction.bars_count
+
+    def data(self, index: QModelIndex, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row, col = index.row(), index.column()
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            if self.is_new_bar_row(row):
+                return self.new_bar[col]
+            return str(self.construction.column(BarConstruction.property_names[col])[row].item())
+        if role == Qt.TextAlignmentRole:
+            return Qt.AlignCenter
+        if role == Qt.BackgroundRole and self.is_new_bar_row(row):
+            return self.new_bar_brush
+        return None
+
+    def headerData(self, section: int, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return BarConstruction.property_names[section]
+        return str(section + 1)
+
+    def flags(self, index: QModelIndex):
+        return Qt.ItemIsSelectable | Qt.ItemIsEnabled | Qt.ItemIsEditable
+
+    @staticmethod
+    def parse_property(col: int, text: str) -> float:
+        value = float(text)
+        if col != len(BarConstruction.property_names) - 1 and value <= 0:
+            raise ValueError
+        return value
+
+    def setData(self, index: QModelIndex, value, role=Qt.EditRole) -> bool:
+        if not index.isValid() or role != Qt.EditRole:
+            return False
+        row, col = index.row(), index.column()
+        text = str(value)
+        try:
+            property_value = self.parse_property(col, text)
+        except ValueError:
+            self.error_occurred.emit(bar_properties_error)
+            if not self.is_new_bar_row(row):
+                return False
+            property_value = None
+
+        if self.is_new_bar_row(row):
+            self.new_bar[col] = text
+        else:
+            self.construction.change_bar_property(row, BarConstruction.property_names[col], property_value)
+            self.bar_changed.emit(row)
+        self.dataChanged.emit(index, index)
+        return True
+
+    def new_bar_properties(self) -> dict:
+        return {name: self.parse_property(col, text)
+                for col, (name, text) in enumerate(zip(BarConstruction.property_names, self.new_bar))}
+
+    def append_bar(self, properties: dict):
+        # The former input row becomes a bar row and a fresh input row is inserted below it
+        row = self.construction.bars_count
+        self.beginInsertRows(QModelIndex(), row + 1, row + 1)
+        self.construction.add_bar(properties)
+        self.new_bar = list(self.default_properties)
+        self.endInsertRows()
+        self.dataChanged.emit(self.index(row, 0), self.index(row + 1, self.columnCount() - 1))
+
+    def remove_last_bar(self):
+        row = self.construction.bars_count - 1
+        if row < 0:
+            return
+        self.beginRemoveRows(QModelIndex(), row, row)
+        self.construction.del_bar()
+        self.endRemoveRows()
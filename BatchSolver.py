@@ -0,0 +1,113 @@
+import argparse
+import csv
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+from ProjectFile import binary_extension, read_project
+from ResultsExport import export_csv, results_header
+
+
+def collect_project_files(paths: list) -> list:
+    filenames = []
+    for path in paths:
+        if os.path.isdir(path):
+            filenames.extend(sorted(os.path.join(path, name) for name in os.listdir(path)
+                                    if name.endswith(('.sapr', binary_extension))))
+        else:
+            filenames.append(path)
+    return filenames
+
+
+def output_name(filename: str) -> str:
+    # The extension is kept, so m.sapr and m.saprb in one directory write different results
+    return os.path.basename(filename)
+
+
+def output_collisions(filenames: list) -> dict:
+    projects = {}
+    for filename in filenames:
+        projects.setdefault(output_name(filename), []).append(filename)
+    return {name: names for name, names in projects.items() if len(names) > 1}
+
+
+def table_rows(values: tuple) -> list:
+    n_bars, x, Nx, Ux, Sx = values
+    return [[n_bar + 1, x_value, N, U, S]
+            for n_bar, x_value, N, U, S in zip(n_bars.tolist(), x.round(4).tolist(), Nx.tolist(),
+                                               Ux.tolist(), Sx.tolist())]
+
+
+def write_csv(filename: str, header: list, rows: list):
+    with open(filename, 'w', newline='', encoding='utf-8') as file:
+        csv_writer = csv.writer(file, delimiter=',')
+        csv_writer.writerow(header)
+        csv_writer.writerows(rows)
+
+
+def solve_project(filename: str, output_dir: str, output_format: str, values_count: int) -> str:
+    construction = read_project(filename)
+    construction.compute_movements_vector()
+    extreme_values = table_rows(construction.extreme_values())
+    movements = construction.movements_vector[:, 0].tolist()
+
+    name = output_name(filename)
+    if output_format == 'json':
+        with open(os.path.join(output_dir, f"{name}.json"), 'w', encoding='utf-8') as file:
+            json.dump({"file": filename, "movements": movements, "columns": results_header,
+                       "extreme_values": extreme_values,
+                       "discrete_values": table_rows(construction.discrete_values(values_count))},
+                      file, ensure_ascii=False)
+    else:
+        write_csv(os.path.join(output_dir, f"{name}.extreme.csv"), results_header, extreme_values)
+        export_csv(construction, os.path.join(output_dir, f"{name}.discrete.csv"), values_count)
+        write_csv(os.path.join(output_dir, f"{name}.movements.csv"), ["Узел", "U"],
+                  [[node + 1, movement] for node, movement in enumerate(movements)])
+    return filename
+
+
+def _solve_project_safely(filename: str, output_dir: str, output_format: str, values_count: int) -> tuple:
+    try:
+        solve_project(filename, output_dir, output_format, values_count)
+        return filename, None
+    except Exception as error:
+        return filename, f"{type(error).__name__}: {error}"
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description="Solve .sapr projects without the graphical interface")
+    parser.add_argument('paths', nargs='+', help=".sapr/.saprb files or directories containing them")
+    parser.add_argument('-o', '--output-dir', default='.', help="directory for the result files")
+    parser.add_argument('-f', '--format', choices=('csv', 'json'), default='csv', dest='output_format')
+    parser.add_argument('-n', '--values-count', type=int, default=10, help="discrete intervals per bar")
+    parser.add_argument('-j', '--jobs', type=int, default=None, help="worker processes (default: all cores)")
+    args = parser.parse_args(argv)
+
+    filenames = collect_project_files(args.paths)
+    collisions = output_collisions(filenames)
+    for name, names in collisions.items():
+        print(f"{', '.join(names)}: results would overwrite each other as {name}", file=sys.stderr)
+    if collisions:
+        return 1
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    arguments = (filenames, repeat(args.output_dir), repeat(args.output_format), repeat(args.values_count))
+    if args.jobs == 1 or len(filenames) <= 1:
+        results = list(map(_solve_project_safely, *arguments))
+    else:
+        with ProcessPoolExecutor(args.jobs) as executor:
+            results = list(executor.map(_solve_project_safely, *arguments))
+
+    failed = 0
+    for filename, error in results:
+        if error is not None:
+            failed += 1
+            print(f"{filename}: {error}", file=sys.stderr)
+    print(f"Solved {len(results) - failed} of {len(results)} projects", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,386 @@
+import numpy as np
+from PyQt5.QtCore import QLineF, QRectF
+from PyQt5.QtGui import QColor, QPen
+from PyQt5.QtWidgets import QGraphicsScene, QGraphicsRectItem, QGraphicsItemGroup, QGraphicsLineItem, QGraphicsItem
+
+from BarConstruction import BarConstruction
+from Colors import Color
+from ConstructionItems import ConstructionItems
+
+
+def take_piece(value: float, percent: float):
+    return value * percent / 100
+
+
+def pixel_columns(indices: np.ndarray, step: float, lod: float) -> np.ndarray:
+    # Scene x of the distinct device pixel columns hit by sorted item indices
+    columns = np.floor(indices * step * lod)
+    return columns[np.r_[True, columns[1:] != columns[:-1]]] / lod
+
+
+class ConstructionOverview(QGraphicsItem):
+    # One item paints every bar and load that has no detail item, aggregated to at most one marker per pixel
+    min_bar_pixels = 4
+
+    def __init__(self, construction_scene):
+        super().__init__()
+        self.construction_scene = construction_scene
+        self.setFlag(QGraphicsItem.ItemUsesExtendedStyleOption)
+        self.bar_pen = QPen(QColor("black"), 2)
+        self.bar_pen.setCosmetic(True)
+        self.bar_force_pen = QPen(QColor(*Color.cyan), 3)
+        self.bar_force_pen.setCosmetic(True)
+        self.nodal_force_pen = QPen(QColor("red"), 2)
+        self.nodal_force_pen.setCosmetic(True)
+
+    def boundingRect(self) -> QRectF:
+        # Cosmetic pens keep their pixel width at any zoom, so a bar length of margin is left around the strip
+        bar_len = ConstructionScene.bar_len
+        width = self.construction_scene.construction.bars_count * bar_len
+        return QRectF(-bar_len, -bar_len / 2, width + 2 * bar_len, ConstructionScene.bar_height + bar_len)
+
+    def paint(self, painter, option, widget=None):
+        bar_len = ConstructionScene.bar_len
+        bars_count = self.construction_scene.construction.bars_count
+        # exposedRect may span the whole item (e.g. QGraphicsView.render), so it is cut down to the device
+        device = QRectF(0, 0, painter.device().width(), painter.device().height())
+        exposed = option.exposedRect.intersected(painter.worldTransform().inverted()[0].mapRect(device))
+        first = max(0, int(exposed.left() // bar_len))
+        stop = min(bars_count, int(exposed.right() // bar_len) + 1)
+        # Bars are laid out along x only, so the horizontal scale decides how much detail fits
+        lod = painter.worldTransform().m11()
+        detail_first, detail_stop = self.construction_scene.detail_bars
+        for start, end in ((first, min(stop, detail_first)), (max(first, detail_stop), stop)):
+            if start < end:
+                self.paint_bars(painter, start, end, lod)
+
+    def paint_bars(self, painter, start: int, end: int, lod: float):
+        construction = self.construction_scene.construction
+        bar_len = ConstructionScene.bar_len
+        bar_height = ConstructionScene.bar_height
+        y = bar_height / 2
+        painter.setPen(self.bar_pen)
+        if bar_len * lod >= self.min_bar_pixels:
+            painter.drawRects([QRectF(n_bar * bar_len, 0, bar_len, bar_height) for n_bar in range(start, end)])
+        else:
+            painter.drawRect(QRectF(start * bar_len, 0, (end - start) * bar_len, bar_height))
+
+        # Loaded bars and nodes are binned by device pixel, so the marker count is bounded by the view width
+        loaded_bars = np.flatnonzero(construction.q[start:end]) + start
+        if len(loaded_bars):
+            painter.setPen(self.bar_force_pen)
+            painter.drawLines([QLineF(x1, y, x1 + max(bar_len, 1 / lod), y)
+                               for x1 in pixel_columns(loaded_bars, bar_len, lod).tolist()])
+        # The node after the segment belongs to the next bar unless it is the last node
+        last_node = end + 1 if end == construction.bars_count else end
+        loaded_nodes = np.flatnonzero(construction.forces[start:last_node]) + start
+        if len(loaded_nodes):
+            x = pixel_columns(loaded_nodes, bar_len, lod)
+            painter.setPen(self.nodal_force_pen)
+            painter.drawLines([QLineF(x1, 0, x1, bar_height) for x1 in x.tolist()])
+
+
+class ConstructionScene(QGraphicsScene):
+    # Items are indexed by bar and node number, so an edit replaces only the glyphs it affects.
+    # Above detail_bars_limit bars only the bars in view get items, and only when zoomed in past detail_scale
+    bar_len = 200
+    bar_height = 100
+    detail_bars_limit = 2000
+    detail_scale = 0.2
+    detail_margin = 2
+
+    def __init__(self, construction: BarConstruction, parent=None):
+        super().__init__(parent)
+        self.construction = construction
+        self.bar_items = {}
+        self.bar_force_items = {}
+        self.nodal_force_items = {}
+        self.termination_items = {}
+        self.overview = None
+        self.detail_bars = (0, 0)
+        self.bar_pen = QPen(QColor("black"), 3)
+        self.nodal_force_pen = QPen(QColor("red"), 3.5)
+        self.bar_force_pen = QPen(QColor(*Color.cyan), 3)
+        self.termination_pen = QPen(QColor("black"), 3)
+
+    @property
+    def level_of_detail(self) -> bool:
+        return self.overview is not None
+
+    def rebuild(self, construction: BarConstruction):
+        self.clear()
+        self.construction = construction
+        self.bar_items = {}
+        self.bar_force_items = {}
+        self.nodal_force_items = {}
+        self.termination_items = {}
+        self.overview = None
+        if construction.bars_count > self.detail_bars_limit:
+            # Few items that come and go with scrolling: a BSP tree would only be rebuilt over and over
+            self.setItemIndexMethod(QGraphicsScene.NoIndex)
+            self.overview = ConstructionOverview(self)
+            self.addItem(self.overview)
+            self.detail_bars = (0, 0)
+            self.refresh_detail()
+        else:
+            self.setItemIndexMethod(QGraphicsScene.BspTreeIndex)
+            self.detail_bars = (0, construction.bars_count)
+            columns = [construction.column(name).tolist() for name in BarConstruction.property_names]
+            for n_bar, properties in enumerate(zip(*columns)):
+                self.add_bar_item(n_bar, dict(zip(BarConstruction.property_names, properties)))
+            for n_bar, q in enumerate(columns[-1]):
+                if q != 0:
+                    self.draw_bar_force(n_bar, q)
+            for node, force in enumerate(construction.forces.tolist()):
+                if force != 0:
+                    self.draw_nodal_force(node, force)
+        self.redraw_terminations()
+
+    def refresh_detail(self):
+        if not self.level_of_detail:
+            return
+        first, stop = 0, 0
+        for view in self.views():
+            scale = view.transform().m11()
+            if scale >= self.detail_scale:
+                region = view.mapToScene(view.viewport().rect()).boundingRect()
+                first = max(0, int(region.left() // self.bar_len) - self.detail_margin)
+                stop = min(self.construction.bars_count, int(region.right() // self.bar_len) + 1 + self.detail_margin)
+                break
+        self.set_detail_bars(first, max(first, stop))
+
+    def set_detail_bars(self, first: int, stop: int):
+        old_first, old_stop = self.detail_bars
+        if (first, stop) == (old_first, old_stop):
+            return
+        for n_bar in range(old_first, old_stop):
+            if not first <= n_bar < stop:
+                self.remove_detail(n_bar)
+        self.detail_bars = (first, stop)
+        for n_bar in range(first, stop):
+            if not old_first <= n_bar < old_stop:
+                self.add_detail(n_bar)
+        self.overview.update()
+
+    def add_detail(self, n_bar: int):
+        self.add_bar_item(n_bar, self.construction.bars[n_bar])
+        self.update_bar(n_bar)
+        self.update_nodal_force(n_bar)
+        if n_bar == self.construction.bars_count - 1:
+            self.update_nodal_force(n_bar + 1)
+
+    def remove_detail(self, n_bar: int):
+        self.remove_glyph(self.bar_items, n_bar)
+        self.remove_glyph(self.bar_force_items, n_bar)
+        self.remove_glyph(self.nodal_force_items, n_bar)
+        if n_bar >= self.construction.bars_count - 1:
+            self.remove_glyph(self.nodal_force_items, n_bar + 1)
+
+    def is_detailed(self, n_bar: int) -> bool:
+        return self.detail_bars[0] <= n_bar < self.detail_bars[1]
+
+    def append_bar(self):
+        # The old last node becomes an inner one, so only its glyph and the right termination move
+        n_bar = self.construction.bars_count - 1
+        if not self.level_of_detail and n_bar >= self.detail_bars_limit:
+            self.rebuild(self.construction)
+            return
+        if self.level_of_detail:
+            self.overview.prepareGeometryChange()
+            self.refresh_detail()
+        else:
+            self.detail_bars = (0, n_bar + 1)
+            self.add_bar_item(n_bar, self.construction.bars[n_bar])
+            self.update_bar(n_bar)
+        self.update_nodal_force(n_bar)
+        self.update_nodal_force(n_bar + 1)
+        self.redraw_terminations()
+
+    def remove_last_bar(self):
+        n_bar = self.construction.bars_count
+        if self.level_of_detail:
+            self.overview.prepareGeometryChange()
+        first, stop = self.detail_bars
+        if first <= n_bar < stop:
+            self.remove_detail(n_bar)
+            self.detail_bars = (min(first, n_bar), n_bar)
+        self.update_nodal_force(n_bar)
+        if self.level_of_detail:
+            self.refresh_detail()
+        self.redraw_terminations()
+
+    def update_bar(self, n_bar: int):
+        if not self.is_detailed(n_bar):
+            if self.level_of_detail:
+                self.overview.update()
+            return
+        properties = self.construction.bars[n_bar]
+        self.bar_items[n_bar].setToolTip(self.bar_tooltip(n_bar, properties))
+        self.remove_glyph(self.bar_force_items, n_bar)
+        if properties['q'] != 0:
+            self.draw_bar_force(n_bar, properties['q'])
+
+    def update_nodal_force(self, node: int):
+        self.remove_glyph(self.nodal_force_items, node)
+        if not self.is_detailed(min(node, self.construction.bars_count - 1)):
+            if self.level_of_detail:
+                self.overview.update()
+            return
+        force = self.construction.forces[node].item()
+        if force != 0:
+            self.draw_nodal_force(node, force)
+
+    def remove_glyph(self, items: dict, key):
+        item = items.pop(key, None)
+        if item is not None:
+            self.removeItem(item)
+
+    @staticmethod
+    def bar_tooltip(n_bar: int, properties: dict) -> str:
+        return f"Номер стержня: {n_bar + 1}\n" \
+               f"E = {properties['E']} [Па]\n" \
+               f"L = {properties['L']} [м]\n" \
+               f"A = {properties['A']} [м^2]\n" \
+               f"S = {properties['S']} [Па]"
+
+    def bar_bounds(self, n_bar: int) -> QRectF:
+        # Bounding rect of the bar item, pen width included
+        return QRectF(n_bar * self.bar_len, 0, self.bar_len, self.bar_height).adjusted(-1.5, -1.5, 1.5, 1.5)
+
+    def add_bar_item(self, n_bar: int, properties: dict):
+        bar = QGraphicsRectItem(n_bar * self.bar_len, 0, self.bar_len, self.bar_height)
+        bar.setPen(self.bar_pen)
+        bar.setToolTip(self.bar_tooltip(n_bar, properties))
+        if self.level_of_detail:
+            bar.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
+        self.addItem(bar)
+        self.bar_items[n_bar] = bar
+
+    def add_glyph(self, glyph: QGraphicsItemGroup, lines: list, pen: QPen):
+        for line in lines:
+            line.setPen(pen)
+            glyph.addToGroup(line)
+        # Glyphs stay above bars that are appended after them
+        glyph.setZValue(1)
+        if self.level_of_detail:
+            glyph.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
+        self.addItem(glyph)
+        return glyph
+
+    def draw_nodal_force(self, node: int, force: float):
+        last_node = node == self.construction.bars_count
+        bounds = self.bar_bounds(node - 1 if last_node else node)
+        bar_width = bounds.width() - 3
+        bar_height = bounds.height() - 3
+        offset_x = 4.5
+        nodal_force = QGraphicsItemGroup()
+        nodal_force.setData(ConstructionItems.NODAL_FORCE.value, node)
+        nodal_force.setToolTip(f"{force} [Н]")
+
+        y1 = bounds.center().y()
+        y2 = {"top": y1 - take_piece(bar_height, 15),
+              "bottom": y1 + take_piece(bar_height, 15)}
+        if not last_node:
+            x1 = bounds.left() + offset_x
+            x2 = x1 + take_piece(bar_width, 100/3)
+            body = QGraphicsLineItem(x1, y1, x2, y1)
+            if force > 0:
+                x1 = x2
+                x2 = x1 - take_piece(bar_width, 7.5)
+            else:
+                x2 = x1 + take_piece(bar_width, 7.5)
+        else:
+            x1 = bounds.right() - offset_x
+            x2 = x1 - take_piece(bar_width, 100/3)
+            body = QGraphicsLineItem(x1, y1, x2, y1)
+            if force > 0:
+                x2 = x1 - take_piece(bar_width, 7.5)
+            else:
+                x1 = x2
+                x2 = x1 + take_piece(bar_width, 7.5)
+
+        lines = [body, QGraphicsLineItem(x1, y1, x2, y2["top"]), QGraphicsLineItem(x1, y1, x2, y2["bottom"])]
+        self.nodal_force_items[node] = self.add_glyph(nodal_force, lines, self.nodal_force_pen)
+
+    def draw_bar_force(self, n_bar: int, force: float):
+        bounds = self.bar_bounds(n_bar)
+        bar_width = bounds.width() - 3
+        bar_height = bounds.height() - 3
+        heads_count = 4
+        offset_x = 4.5
+        bar_force = QGraphicsItemGroup()
+        bar_force.setData(ConstructionItems.BAR_FORCE.value, n_bar)
+        bar_force.setToolTip(f"{force} [Н/м]")
+
+        y1 = bounds.center().y()
+        lines = [QGraphicsLineItem(bounds.left() + offset_x, y1, bounds.right() - offset_x, y1)]
+        x_diff = bar_width / heads_count
+        y2 = {"top": y1 - take_piece(bar_height, 10),
+              "bottom": y1 + take_piece(bar_height, 10)}
+        x1 = bounds.left() if force > 0 else bounds.right()
+        for _ in range(heads_count):
+            if force > 0:
+                x1 += x_diff
+                x2 = x1 - take_piece(bar_width, 5)
+            else:
+                x1 -= x_diff
+                x2 = x1 + take_piece(bar_width, 5)
+            lines.append(QGraphicsLineItem(x1, y1, x2, y2["top"]))
+            lines.append(QGraphicsLineItem(x1, y1, x2, y2["bottom"]))
+        self.bar_force_items[n_bar] = self.add_glyph(bar_force, lines, self.bar_force_pen)
+
+    def redraw_terminations(self):
+        for termination in ("left", "right"):
+            self.remove_glyph(self.termination_items, termination)
+        if self.construction.bars_count == 0:
+            return
+        if self.construction.terminations["left"]:
+            self.draw_left_termination()
+        if self.construction.terminations["right"]:
+            self.draw_right_termination()
+
+    def draw_left_termination(self):
+        diag_lines_count = 6
+        bounds = self.bar_bounds(0)
+        bar_width = bounds.width()
+        bar_height = bounds.height()
+        left_termination = QGraphicsItemGroup()
+        left_termination.setData(ConstructionItems.LEFT_TERMINATION.value, True)
+        pos1 = bounds.topLeft()
+        pos2 = bounds.bottomLeft()
+        v_line = QGraphicsLineItem(pos1.x() + 1.5, pos1.y() - take_piece(bar_height, 5),
+                                   pos2.x() + 1.5, pos2.y() + take_piece(bar_height, 5))
+        v_line.setPen(self.termination_pen)
+        lines = [v_line]
+
+        x1 = v_line.boundingRect().topLeft().x() + 1.5
+        x2 = v_line.boundingRect().topLeft().x() - take_piece(bar_height, 10) + 1.5
+        y_diff = v_line.boundingRect().height() / diag_lines_count
+        for i in range(diag_lines_count + 1):
+            y1 = v_line.boundingRect().topLeft().y() + i * y_diff
+            y2 = y1 + take_piece(bar_width, 5)
+            lines.append(QGraphicsLineItem(x1, y1, x2, y2))
+        self.termination_items["left"] = self.add_glyph(left_termination, lines, self.termination_pen)
+
+    def draw_right_termination(self):
+        diag_lines_count = 6
+        bounds = self.bar_bounds(self.construction.bars_count - 1)
+        bar_width = bounds.width()
+        bar_height = bounds.height()
+        right_termination = QGraphicsItemGroup()
+        right_termination.setData(ConstructionItems.RIGHT_TERMINATION.value, True)
+        pos1 = bounds.topRight()
+        pos2 = bounds.bottomRight()
+        v_line = QGraphicsLineItem(pos1.x() - 1.5, pos1.y() - take_piece(bar_height, 5),
+                                   pos2.x() - 1.5, pos2.y() + take_piece(bar_height, 5))
+        v_line.setPen(self.termination_pen)
+        lines = [v_line]
+
+        x1 = v_line.boundingRect().topRight().x()
+        x2 = v_line.boundingRect().topRight().x() + take_piece(bar_height, 10)
+        y_diff = v_line.boundingRect().height() / diag_lines_count
+        for i in range(diag_lines_count + 1):
+            y1 = v_line.boundingRect().topRight().y() + i * y_diff
+            y2 = y1 - take_piece(bar_width, 5)
+            lines.append(QGraphicsLineItem(x1, y1, x2, y2))
+        self.termination_items["right"] = self.add_glyph(right_termination, lines, self.termination_pen)
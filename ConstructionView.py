@@ -0,0 +1,31 @@
+from PyQt5 import QtGui, QtCore
+from PyQt5.QtWidgets import QGraphicsView
+
+
+class ConstructionView(QGraphicsView):
+    # Ctrl + wheel zooms; every change of the visible region is reported to the scene for level of detail
+    zoom_factor = 1.15
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setTransformationAnchor(QGraphicsView.AnchorUnderMouse)
+
+    def wheelEvent(self, e: QtGui.QWheelEvent):
+        if e.modifiers() & QtCore.Qt.ControlModifier:
+            factor = self.zoom_factor ** (e.angleDelta().y() / 120)
+            self.scale(factor, factor)
+            self.refresh_detail()
+        else:
+            super().wheelEvent(e)
+
+    def scrollContentsBy(self, dx: int, dy: int):
+        super().scrollContentsBy(dx, dy)
+        self.refresh_detail()
+
+    def resizeEvent(self, e: QtGui.QResizeEvent):
+        super().resizeEvent(e)
+        self.refresh_detail()
+
+    def refresh_detail(self):
+        if self.scene() is not None:
+            self.scene().refresh_detail()
@@ -1,9 +1,87 @@
+import numpy as np
+from matplotlib import rcParams
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg
+from matplotlib.collections import LineCollection, PolyCollection
 from matplotlib.figure import Figure
+from matplotlib.lines import Line2D
+from matplotlib.patches import Polygon
 
 
 class EpureCanvas(FigureCanvasQTAgg):
+    # Up to this many bars every bar keeps its own colour; longer epures are one polyline and one polygon
+    coloured_bars_limit = 200
+
     def __init__(self, parent=None, width=5, height=4, dpi=100):
         self.fig = Figure(figsize=(width, height), dpi=dpi)
         self.axes = self.fig.add_subplot(111)
+        self.lines = None
+        self.fills = None
+        self.bars_count = None
+        self.draw_pending = False
         super(EpureCanvas, self).__init__(self.fig)
+
+    def draw_epure(self, n_bars: np.ndarray, x: np.ndarray, y: np.ndarray):
+        # Samples are ordered by bar and bars may have different numbers of them; the artists are reused in place
+        # while the number of bars stays the same
+        bars_count = int(n_bars[-1]) + 1
+        if bars_count != self.bars_count:
+            self.create_artists(n_bars, x, y)
+        elif bars_count <= self.coloured_bars_limit:
+            curves = self.bar_curves(n_bars, x, y)
+            self.lines.set_segments(curves)
+            self.fills.set_verts(self.bar_polygons(curves))
+        else:
+            self.lines.set_data(x, y)
+            self.fills.set_xy(self.epure_polygon(x, y))
+
+        self.axes.ignore_existing_data_limits = True
+        self.axes.update_datalim([(x.min(), min(y.min(), 0)), (x.max(), max(y.max(), 0))])
+        self.axes.autoscale_view()
+        self.request_draw()
+
+    def request_draw(self):
+        # Only a visible epure is rendered, on the next pass of the event loop; a hidden one waits for its tab
+        self.draw_pending = not self.isVisible()
+        if not self.draw_pending:
+            self.draw_idle()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self.draw_pending:
+            self.draw_pending = False
+            self.draw_idle()
+
+    def create_artists(self, n_bars: np.ndarray, x: np.ndarray, y: np.ndarray):
+        if self.lines is not None:
+            self.lines.remove()
+            self.fills.remove()
+        bars_count = int(n_bars[-1]) + 1
+        if bars_count <= self.coloured_bars_limit:
+            cycle = rcParams['axes.prop_cycle'].by_key()['color']
+            colors = [cycle[n_bar % len(cycle)] for n_bar in range(bars_count)]
+            curves = self.bar_curves(n_bars, x, y)
+            self.fills = PolyCollection(self.bar_polygons(curves), facecolors=colors, edgecolors='none', zorder=1)
+            self.lines = LineCollection(curves, colors=colors, zorder=2)
+            self.axes.add_collection(self.fills, autolim=False)
+            self.axes.add_collection(self.lines, autolim=False)
+        else:
+            # add_patch would walk every vertex for the data limits, which are set directly in draw_epure
+            self.fills = Polygon(self.epure_polygon(x, y), closed=True, facecolor='C0', edgecolor='none', zorder=1)
+            self.lines = Line2D(x, y, color='C0', zorder=2)
+            self.axes.add_artist(self.fills)
+            self.axes.add_artist(self.lines)
+        self.bars_count = bars_count
+
+    @staticmethod
+    def bar_curves(n_bars: np.ndarray, x: np.ndarray, y: np.ndarray) -> list:
+        return np.split(np.column_stack((x, y)), np.flatnonzero(np.diff(n_bars)) + 1)
+
+    @staticmethod
+    def bar_polygons(curves: list) -> list:
+        # Each bar's curve followed by its baseline back to the start
+        return [np.vstack((curve, [[curve[-1, 0], 0], [curve[0, 0], 0]])) for curve in curves]
+
+    @staticmethod
+    def epure_polygon(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        # The whole curve closed along the axis; areas on both sides of it have winding number one
+        return np.column_stack((np.r_[x[0], x, x[-1]], np.r_[0, y, 0]))
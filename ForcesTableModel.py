@@ -0,0 +1,131 @@
+import numpy as np
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, Qt, pyqtSignal
+from PyQt5.QtGui import QBrush, QColor
+
+from BarConstruction import BarConstruction
+from Colors import Color
+
+
+class ForcesTableModel(QAbstractTableModel):
+    # Rows list the loaded nodes; forces are read from the construction, the last row holds the next load
+    force_changed = pyqtSignal(int)
+    error_occurred = pyqtSignal(str)
+    header = ["Номер узла", "F"]
+
+    def __init__(self, construction: BarConstruction, parent=None):
+        super().__init__(parent)
+        self.construction = construction
+        self.nodes = []
+        self.new_force = ["-", "-"]
+        self.new_force_brush = QBrush(QColor(*Color.light_yellow))
+
+    def set_construction(self, construction: BarConstruction):
+        self.beginResetModel()
+        self.construction = construction
+        self.nodes = np.flatnonzero(construction.forces).tolist()
+        self.new_force = ["-", "-"]
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.nodes) + 1
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.header)
+
+    def is_new_force_row(self, row: int) -> bool:
+        return row == len(self.nodes)
+
+    def data(self, index: QModelIndex, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row, col = index.row(), index.column()
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            if self.is_new_force_row(row):
+                return self.new_force[col]
+            node = self.nodes[row]
+            return str(node + 1) if col == 0 else str(self.construction.forces[node].item())
+        if role == Qt.TextAlignmentRole:
+            return Qt.AlignCenter
+        if role == Qt.BackgroundRole and self.is_new_force_row(row):
+            return self.new_force_brush
+        return None
+
+    def headerData(self, section: int, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self.header[section]
+        return str(section + 1)
+
+    def flags(self, index: QModelIndex):
+        flags = Qt.ItemIsSelectable | Qt.ItemIsEnabled
+        # The node of an existing load is fixed; it is removed with Delete and added again instead
+        if index.column() == 1 or self.is_new_force_row(index.row()):
+            flags |= Qt.ItemIsEditable
+        return flags
+
+    def setData(self, index: QModelIndex, value, role=Qt.EditRole) -> bool:
+        if not index.isValid() or role != Qt.EditRole:
+            return False
+        row, col = index.row(), index.column()
+        text = str(value)
+        if self.is_new_force_row(row):
+            self.new_force[col] = text
+        else:
+            try:
+                force = float(text)
+            except ValueError:
+                self.error_occurred.emit("Значение нагрузки должно быть вещественным числом!")
+                return False
+            node = self.nodes[row]
+            self.construction.change_force(node + 1, force)
+            self.force_changed.emit(node)
+        self.dataChanged.emit(index, index)
+        return True
+
+    def new_force_value(self) -> tuple:
+        if self.construction.bars_count == 0:
+            raise ValueError("Сначала нужно добавить хотя бы один стержень!")
+        try:
+            node = int(self.new_force[0])
+        except ValueError:
+            raise ValueError("Номер узла должен быть целым положительным числом!") from None
+        if node > self.construction.nodes_count:
+            raise ValueError("Введенный номер узла выходит за границы конструкции!")
+        if node <= 0:
+            raise ValueError("Номер узла должен быть целым положительным числом!")
+        if self.construction.forces[node - 1] != 0:
+            raise ValueError(f"Нагрузка на узел №{node} уже была добавлена ранее!")
+        try:
+            force = float(self.new_force[1])
+        except ValueError:
+            raise ValueError("Значение нагрузки должно быть вещественным числом!") from None
+        return node, force
+
+    def append_force(self, node: int, force: float):
+        row = len(self.nodes)
+        self.beginInsertRows(QModelIndex(), row + 1, row + 1)
+        self.construction.change_force(node, force)
+        self.nodes.append(node - 1)
+        self.new_force = ["-", "-"]
+        self.endInsertRows()
+        self.dataChanged.emit(self.index(row, 0), self.index(row + 1, self.columnCount() - 1))
+        self.force_changed.emit(node - 1)
+
+    def remove_force(self, row: int):
+        if self.is_new_force_row(row):
+            return
+        node = self.nodes[row]
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self.nodes[row]
+        self.construction.change_force(node + 1, 0)
+        self.endRemoveRows()
+        self.force_changed.emit(node)
+
+    def remove_detached_nodes(self):
+        # Loads on nodes that no longer exist after a bar is deleted; their forces are left to add_bar to reset
+        for row in reversed(range(len(self.nodes))):
+            if self.nodes[row] >= self.construction.nodes_count:
+                self.beginRemoveRows(QModelIndex(), row, row)
+                del self.nodes[row]
+                self.endRemoveRows()
@@ -1,25 +1,12 @@
 from PyQt5 import QtGui, QtCore
-from PyQt5.QtGui import QBrush, QColor
-from PyQt5.QtWidgets import QTableWidget, QTableWidgetItem
-from Colors import Color
+from PyQt5.QtWidgets import QTableView
 
 
-class ForcesTableWidget(QTableWidget):
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.deleted_items = None
-
+class ForcesTableWidget(QTableView):
     def keyPressEvent(self, e: QtGui.QKeyEvent):
         if e.key() == QtCore.Qt.Key_Delete:
-            item = self.currentItem()
-            if item.background() == QBrush(QColor(*Color.light_yellow)):
-                return
-            row = item.row()
-            self.removeRow(row)
-            self.deleted_items = None
+            index = self.currentIndex()
+            if index.isValid():
+                self.model().remove_force(index.row())
         else:
             super().keyPressEvent(e)
-
-    def rowsAboutToBeRemoved(self, parent: QtCore.QModelIndex, start: int, end: int):
-        row = self.currentRow()
-        self.deleted_items = [self.item(row, col) for col in range(self.columnCount())]
@@ -0,0 +1,108 @@
+import cProfile
+import io
+import logging
+import pstats
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+logger = logging.getLogger("SAPR")
+
+phase_labels = {
+    "assembly": "Сборка",
+    "factorization": "Факторизация",
+    "solve": "Решение",
+    "compilation": "Коэффициенты",
+    "sampling": "Выборка",
+    "table": "Таблица",
+    "epures": "Эпюры",
+    "export": "Экспорт",
+}
+
+
+class Instrumentation:
+    # Timers and counters of the compute phases, logged at DEBUG level. While a capture is on, timed phases are also
+    # profiled with cProfile and allocations are traced with tracemalloc. Only one profiler may be active at a time
+    # (on Python 3.12+ per interpreter), so a phase that starts while another is profiled, in any thread, is only timed.
+    def __init__(self):
+        self.last = {}
+        self.totals = {}
+        self.calls = {}
+        self.counters = {}
+        self.capturing = False
+        self.profiles = []
+        self.profiling = threading.Lock()
+
+    @contextmanager
+    def timer(self, phase: str):
+        profile = None
+        if self.capturing and self.profiling.acquire(blocking=False):
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError:
+                # Another profiling tool, e.g. a debugger, is already active
+                self.profiling.release()
+                profile = None
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            if profile is not None:
+                profile.disable()
+                self.profiling.release()
+                self.profiles.append(profile)
+            self.last[phase] = elapsed
+            self.totals[phase] = self.totals.get(phase, 0) + elapsed
+            self.calls[phase] = self.calls.get(phase, 0) + 1
+            logger.debug("%s: %.3f ms", phase, elapsed * 1000)
+
+    def count(self, name: str, value: int = 1):
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def new_run(self):
+        # Only the phases of the latest computation are shown in the summary
+        self.last = {}
+
+    def summary(self) -> str:
+        return " | ".join(f"{label} {self.last[phase] * 1000:.1f} мс"
+                          for phase, label in phase_labels.items() if phase in self.last)
+
+    def start_capture(self):
+        self.totals = {}
+        self.calls = {}
+        self.counters = {}
+        self.profiles = []
+        tracemalloc.start()
+        self.capturing = True
+        logger.info("Profiling started")
+
+    def stop_capture(self) -> str:
+        self.capturing = False
+        lines = [f"{phase}: {self.calls[phase]} calls, {self.totals[phase] * 1000:.1f} ms" for phase in self.totals]
+        lines += [f"{name}: {value}" for name, value in self.counters.items()]
+
+        if tracemalloc.is_tracing():
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            lines.append(f"\nTraced memory: {current / 2 ** 20:.1f} MiB, peak {peak / 2 ** 20:.1f} MiB")
+            lines += [str(statistic) for statistic in snapshot.statistics('lineno')[:10]]
+
+        if self.profiles:
+            stream = io.StringIO()
+            stats = pstats.Stats(self.profiles[0], stream=stream)
+            for profile in self.profiles[1:]:
+                stats.add(profile)
+            stats.sort_stats('cumulative').print_stats(25)
+            lines.append(stream.getvalue())
+        self.profiles = []
+
+        report = "\n".join(lines)
+        logger.info("Profiling report:\n%s", report)
+        return report
+
+
+instrumentation = Instrumentation()
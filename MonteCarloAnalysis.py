@@ -0,0 +1,107 @@
+import numpy as np
+
+from BarConstruction import BarConstruction, ChainFactorization
+from PiecewiseResults import bar_extremes, chain_loads
+
+
+class MonteCarloAnalysis:
+    variable_names = ('E', 'A', 'F', 'q')
+    field_names = ('N', 'U', 'S')
+    chunk_elements = 2 ** 22
+
+    def __init__(self, construction: BarConstruction, seed: int = None):
+        self.construction = construction
+        self.seed = seed
+        self.variables = {}
+
+    def add_variable(self, name: str, std: float, relative: bool = True, distribution: str = 'normal'):
+        # std is a coefficient of variation when relative, otherwise an absolute standard deviation.
+        # The lognormal distribution keeps the mean and only makes sense for relative variations.
+        if name not in self.variable_names:
+            raise ValueError(f"Unknown random variable '{name}'")
+        if distribution not in ('normal', 'lognormal'):
+            raise ValueError(f"Unknown distribution '{distribution}'")
+        if distribution == 'lognormal' and not relative:
+            raise ValueError("Lognormal variables must have a relative standard deviation")
+        self.variables[name] = (std, relative, distribution)
+
+    def _mean_values(self) -> dict:
+        construction = self.construction
+        return {'E': construction.E, 'L': construction.L, 'A': construction.A, 'S': construction.S,
+                'q': construction.q, 'F': construction.forces}
+
+    def _draw(self, generator: np.random.Generator, mean: np.ndarray, variable: tuple, samples: int) -> np.ndarray:
+        std, relative, distribution = variable
+        # Samples are drawn sample-major, so a seeded stream does not depend on the chunk size
+        z = generator.standard_normal((samples, len(mean))).T
+        if distribution == 'lognormal':
+            sigma = np.sqrt(np.log1p(std ** 2))
+            return mean[:, None] * np.exp(sigma * z - sigma ** 2 / 2)
+        if relative:
+            return mean[:, None] * (1 + std * z)
+        return mean[:, None] + std * z
+
+    def run(self, samples: int, chunk_size: int = None) -> dict:
+        if self.construction.bars_count == 0:
+            raise ValueError("The construction has no bars")
+
+        construction = self.construction
+        chunk_size = chunk_size or max(1, self.chunk_elements // construction.nodes_count)
+        means = self._mean_values()
+        names = list(self.variables)
+        generators = [np.random.default_rng(seed) for seed in np.random.SeedSequence(self.seed).spawn(len(names))]
+
+        statistics = {name: {'mean': np.zeros(construction.bars_count), 'M2': np.zeros(construction.bars_count),
+                             'min': np.full(construction.bars_count, np.inf),
+                             'max': np.full(construction.bars_count, -np.inf)}
+                      for name in self.field_names}
+        failures = np.zeros(construction.bars_count)
+        system_failures = 0
+        accepted = 0
+        done = 0
+        while done < samples:
+            count = min(chunk_size, samples - done)
+            done += count
+            columns = {name: np.repeat(values[:, None], count, axis=1) for name, values in means.items()}
+            for name, generator in zip(names, generators):
+                columns[name] = self._draw(generator, means[name], self.variables[name], count)
+            # Normal draws of E or A may be non-positive, which is no physical bar: such samples are rejected
+            valid = np.all(columns['E'] > 0, axis=0) & np.all(columns['A'] > 0, axis=0)
+            if not valid.any():
+                continue
+            E, L, A, S, q, F = (columns[name][:, valid] for name in ('E', 'L', 'A', 'S', 'q', 'F'))
+
+            U = ChainFactorization(E * A / L, construction.terminations).solve(chain_loads(L, q, F))
+            extremes = bar_extremes(E, L, A, q, U)
+
+            for name in self.field_names:
+                values = np.maximum(np.abs(extremes[f'{name}_min']), np.abs(extremes[f'{name}_max']))
+                self._merge(statistics[name], values, accepted)
+            failed = np.maximum(np.abs(extremes['S_min']), np.abs(extremes['S_max'])) >= S
+            failures += failed.sum(axis=1)
+            system_failures += np.count_nonzero(failed.any(axis=0))
+            accepted += E.shape[1]
+
+        if accepted == 0:
+            raise ValueError("Every sample has a non-positive E or A")
+        results = {'samples': accepted, 'rejected_samples': samples - accepted}
+        for name, field_statistics in statistics.items():
+            results[name] = {'mean': field_statistics['mean'],
+                             'std': np.sqrt(field_statistics['M2'] / max(accepted - 1, 1)),
+                             'min': field_statistics['min'], 'max': field_statistics['max']}
+        results['failure_probability'] = failures / accepted
+        results['system_failure_probability'] = system_failures / accepted
+        return results
+
+    @staticmethod
+    def _merge(statistics: dict, values: np.ndarray, count: int):
+        # Pairwise (Chan) merge of running mean and sum of squared deviations with a new chunk
+        chunk_count = values.shape[1]
+        chunk_mean = values.mean(axis=1)
+        chunk_M2 = ((values - chunk_mean[:, None]) ** 2).sum(axis=1)
+        total = count + chunk_count
+        delta = chunk_mean - statistics['mean']
+        statistics['mean'] += delta * chunk_count / total
+        statistics['M2'] += chunk_M2 + delta ** 2 * count * chunk_count / total
+        np.minimum(statistics['min'], values.min(axis=1), out=statistics['min'])
+        np.maximum(statistics['max'], values.max(axis=1), out=statistics['max'])
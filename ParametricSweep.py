@@ -0,0 +1,119 @@
+import csv
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import numpy as np
+
+from BarConstruction import BarConstruction, ChainFactorization
+from PiecewiseResults import bar_extremes, chain_loads
+
+_worker_model = None
+
+
+def _init_worker(model: dict):
+    global _worker_model
+    _worker_model = model
+
+
+def _solve_chunk(parameters: list, values: np.ndarray, model: dict = None) -> np.ndarray:
+    # Every sweep point of the chunk is one column of a stacked (bars x points) system
+    model = _worker_model if model is None else model
+    points = len(values)
+    columns = {name: np.repeat(model[name][:, None], points, axis=1) for name in ParametricSweep.parameter_names}
+    for (name, index), column in zip(parameters, values.T):
+        columns[name][index] = column
+    E, L, A, S, q, F = (columns[name] for name in ParametricSweep.parameter_names)
+
+    U = ChainFactorization(E * A / L, model['terminations']).solve(chain_loads(L, q, F))
+
+    extremes = bar_extremes(E, L, A, q, U)
+    max_S = np.maximum(np.abs(extremes['S_min']), np.abs(extremes['S_max']))
+    max_U = np.maximum(np.abs(extremes['U_min']), np.abs(extremes['U_max'])).max(axis=0)
+
+    margin = np.min((S - max_S) / S, axis=0)
+    return np.column_stack((max_S.max(axis=0), max_U, margin))
+
+
+class ParametricSweep:
+    parameter_names = ('E', 'L', 'A', 'S', 'q', 'F')
+    result_names = ('max|S|', 'max|U|', 'margin')
+    chunk_elements = 2 ** 22
+    parallel_threshold = 2 ** 24
+
+    def __init__(self, construction: BarConstruction):
+        self.construction = construction
+        self.parameters = []
+        self.values = []
+
+    def add_parameter(self, name: str, index: int, values):
+        # index counts bars (or nodes for F) from zero; several parameters span a full grid of points
+        if name not in self.parameter_names:
+            raise ValueError(f"Unknown sweep parameter '{name}'")
+        limit = self.construction.nodes_count if name == 'F' else self.construction.bars_count
+        if not 0 <= index < limit:
+            raise IndexError(f"{name} index {index} is out of the construction")
+        values = np.asarray(values, dtype=float)
+        if name in ('E', 'L', 'A', 'S') and not np.all(values > 0):
+            raise ValueError(f"Swept values of {name} must be positive")
+        self.parameters.append((name, index))
+        self.values.append(values)
+
+    def points(self) -> np.ndarray:
+        grid = np.meshgrid(*self.values, indexing='ij')
+        return np.column_stack([axis.ravel() for axis in grid])
+
+    def _model(self) -> dict:
+        model = {name: self.construction.column(name).copy() for name in BarConstruction.property_names}
+        model['F'] = self.construction.forces.copy()
+        model['terminations'] = dict(self.construction.terminations)
+        return model
+
+    def _chunks(self, points: np.ndarray):
+        chunk = max(1, self.chunk_elements // self.construction.nodes_count)
+        for start in range(0, len(points), chunk):
+            yield points[start:start + chunk]
+
+    def run(self, filename: str = None, workers: int = None) -> dict:
+        if not self.parameters:
+            raise ValueError("At least one sweep parameter is required")
+        if self.construction.bars_count == 0:
+            raise ValueError("The construction has no bars")
+
+        points = self.points()
+        model = self._model()
+        if workers is None:
+            workers = 1 if self.construction.bars_count * len(points) < self.parallel_threshold else os.cpu_count()
+
+        header = [f"{name}[{index}]" for name, index in self.parameters] + list(self.result_names)
+        csv_file = open(filename, 'w', newline='') if filename and filename.endswith('.csv') else None
+        try:
+            csv_writer = None
+            if csv_file is not None:
+                csv_writer = csv.writer(csv_file, delimiter=',')
+                csv_writer.writerow(header)
+
+            results = []
+            if workers > 1:
+                with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(model,)) as executor:
+                    chunks = list(self._chunks(points))
+                    for chunk, chunk_results in zip(chunks, executor.map(_solve_chunk, repeat(self.parameters), chunks)):
+                        results.append(chunk_results)
+                        if csv_writer is not None:
+                            csv_writer.writerows(np.column_stack((chunk, chunk_results)).tolist())
+            else:
+                for chunk in self._chunks(points):
+                    chunk_results = _solve_chunk(self.parameters, chunk, model)
+                    results.append(chunk_results)
+                    if csv_writer is not None:
+                        csv_writer.writerows(np.column_stack((chunk, chunk_results)).tolist())
+        finally:
+            if csv_file is not None:
+                csv_file.close()
+
+        results = np.concatenate(results)
+        sweep_results = {'points': points, 'parameters': header[:len(self.parameters)]}
+        sweep_results.update({name: results[:, i] for i, name in enumerate(self.result_names)})
+        if filename and filename.endswith('.npz'):
+            np.savez(filename, points=points, results=results, columns=np.array(header))
+        return sweep_results
@@ -0,0 +1,132 @@
+import numpy as np
+
+
+def bar_coefficients(E, L, A, q, movements) -> tuple:
+    # Coefficients of N, U and S by power of x, indexed by bar (movements by node); arrays may carry trailing axes:
+    # N(x) = EA/L (U2 - U1) + qL/2 - qx and U(x) = U1 + ((U2 - U1)/L + qL/2EA) x - q/2EA x^2
+    stiffness = E * A
+    U1, U2 = movements[:-1], movements[1:]
+    N0 = stiffness / L * (U2 - U1) + q * L / 2
+    N1 = -q
+    return (N0, N1, 0), (U1, (U2 - U1) / L + q * L / (2 * stiffness), -q / (2 * stiffness)), (N0 / A, N1 / A, 0)
+
+
+def chain_loads(L, q, forces) -> np.ndarray:
+    # Nodal forces plus half of every bar's distributed load at each of its two nodes; arrays may carry trailing axes
+    half_loads = q * L / 2
+    loads = np.array(forces, dtype=float)
+    loads[:-1] += half_loads
+    loads[1:] += half_loads
+    return loads
+
+
+def quadratic_vertices(L, b, c) -> tuple:
+    # Vertex of b x + c x^2 (zero where it is not strictly inside the bar) and the mask of bars where it is
+    x = np.divide(-b, 2 * c, out=np.full(np.shape(c), -np.inf), where=c != 0)
+    inside = (x > 0) & (x < L)
+    return np.where(inside, x, 0), inside
+
+
+def polynomial_extremes(L, coefficients) -> dict:
+    # Exact minimum and maximum of every field on every bar: N and S are linear, U adds its vertex
+    extremes = {}
+    for name, (c0, c1, _) in zip(PiecewiseResults.field_names, coefficients):
+        ends = c0, c0 + c1 * L
+        extremes[f'{name}_min'] = np.minimum(*ends)
+        extremes[f'{name}_max'] = np.maximum(*ends)
+
+    U0, b, c = coefficients[1]
+    x, inside = quadratic_vertices(L, b, c)
+    vertex_U = U0 + np.where(inside, x * (b + c * x), 0)
+    end_U = U0 + L * (b + c * L)
+    extremes['U_min'] = np.minimum(np.minimum(U0, end_U), vertex_U)
+    extremes['U_max'] = np.maximum(np.maximum(U0, end_U), vertex_U)
+    return extremes
+
+
+def bar_extremes(E, L, A, q, movements) -> dict:
+    return polynomial_extremes(L, bar_coefficients(E, L, A, q, movements))
+
+
+class PiecewiseResults:
+    # A solved construction compiled into polynomials of the local coordinate x of each bar:
+    # coefficients[field, power] is the contiguous per-bar column of N, U or S for powers 0 to 2. The arrays are
+    # read-only copies, so the object stays valid while the construction it came from is edited.
+    field_names = ('N', 'U', 'S')
+    degrees = (1, 2, 1)
+
+    def __init__(self, node_coordinates, lengths, stiffness, movements, coefficients):
+        self.node_coordinates = self._frozen(node_coordinates)
+        self.lengths = self._frozen(lengths)
+        self.stiffness = self._frozen(stiffness)
+        self.movements = self._frozen(movements)
+        self.coefficients = self._frozen(coefficients)
+
+    @staticmethod
+    def _frozen(values) -> np.ndarray:
+        values = np.array(values, dtype=float)
+        values.flags.writeable = False
+        return values
+
+    @classmethod
+    def from_solution(cls, E, L, A, q, movements, node_coordinates):
+        coefficients = np.zeros((3, 3, len(L)))
+        for field, powers in enumerate(bar_coefficients(E, L, A, q, movements)):
+            for power, values in enumerate(powers):
+                coefficients[field, power] = values
+        return cls(node_coordinates, L, E * A, movements, coefficients)
+
+    @property
+    def bars_count(self) -> int:
+        return len(self.lengths)
+
+    def locate(self, x) -> tuple:
+        x = np.asarray(x, dtype=float)
+        n_bars = np.minimum(np.searchsorted(self.node_coordinates[1:], x), self.bars_count - 1)
+        return n_bars, x - self.node_coordinates[n_bars]
+
+    def evaluate(self, n_bars, x) -> tuple:
+        # Horner's scheme up to the degree of each field, gathering one coefficient column at a time
+        x = np.asarray(x, dtype=float)
+        fields = []
+        for coefficients, degree in zip(self.coefficients, self.degrees):
+            values = coefficients[degree].take(n_bars)
+            for power in range(degree - 1, -1, -1):
+                values = values * x + coefficients[power].take(n_bars)
+            fields.append(values)
+        return tuple(fields)
+
+    def evaluate_at(self, x) -> tuple:
+        return self.evaluate(*self.locate(x))
+
+    def integrals(self) -> np.ndarray:
+        # (bars x fields) integrals of N, U and S over each bar
+        powers = np.arange(1, 4).reshape(-1, 1)
+        return np.sum(self.coefficients * self.lengths ** powers / powers, axis=1).T
+
+    def elongations(self) -> np.ndarray:
+        # Integral of the strain N / EA, that is U(L) - U(0)
+        L = self.lengths
+        return self.coefficients[1, 1] * L + self.coefficients[1, 2] * L ** 2
+
+    def strain_energies(self) -> np.ndarray:
+        # Integral of N^2 / 2EA with N(x) = N0 + N1 x
+        N0, N1 = self.coefficients[0, 0], self.coefficients[0, 1]
+        L = self.lengths
+        return (N0 ** 2 * L + N0 * N1 * L ** 2 + N1 ** 2 * L ** 3 / 3) / (2 * self.stiffness)
+
+    def vertices(self) -> tuple:
+        return quadratic_vertices(self.lengths, self.coefficients[1, 1], self.coefficients[1, 2])
+
+    def extremes(self) -> dict:
+        return polynomial_extremes(self.lengths, self.coefficients)
+
+    def save(self, filename: str):
+        np.savez(filename, node_coordinates=self.node_coordinates, lengths=self.lengths, stiffness=self.stiffness,
+                 movements=self.movements, coefficients=self.coefficients)
+
+    @classmethod
+    def load(cls, filename: str):
+        with np.load(filename) as data:
+            return cls(data['node_coordinates'], data['lengths'], data['stiffness'], data['movements'],
+                       data['coefficients'])
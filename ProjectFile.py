@@ -0,0 +1,246 @@
+import math
+import os
+import struct
+import sys
+
+import numpy as np
+
+from BarConstruction import BarConstruction
+
+binary_extension = '.saprb'
+binary_magic = b'SAPRBIN\0'
+binary_version = 1
+# magic, version, termination flags, bars count; float64 arrays E, L, A, S, q, F and node coordinates follow
+binary_header = struct.Struct('<8sIIQ')
+
+
+def read_project(filename: str, mmap: bool = True) -> BarConstruction:
+    if filename.endswith(binary_extension):
+        return read_binary_project(filename, mmap)
+    return read_text_project(filename)
+
+
+def write_project(construction: BarConstruction, filename: str):
+    if filename.endswith(binary_extension):
+        write_binary_project(construction, filename)
+    else:
+        write_text_project(construction, filename)
+
+
+def convert_project(source: str, target: str):
+    write_project(read_project(source, mmap=False), target)
+
+
+class ProjectFileError(ValueError):
+    def __init__(self, filename: str, line_number: int, message: str):
+        location = f"{filename}, строка {line_number}" if line_number is not None else filename
+        super().__init__(f"{location}: {message}")
+        self.filename = filename
+        self.line_number = line_number
+
+
+class _RowsBuffer:
+    # Parsed rows are batched in a short list and flushed into a growable float64 array
+    def __init__(self, width: int = None, chunk_rows: int = 65536):
+        self.shape = () if width is None else (width,)
+        self.values = np.zeros((chunk_rows,) + self.shape)
+        self.count = 0
+        self.pending = []
+        self.chunk_rows = chunk_rows
+
+    def __len__(self) -> int:
+        return self.count + len(self.pending)
+
+    def append(self, row):
+        self.pending.append(row)
+        if len(self.pending) == self.chunk_rows:
+            self.flush()
+
+    def flush(self):
+        if not self.pending:
+            return
+        if self.count + len(self.pending) > len(self.values):
+            grown = np.zeros((2 * len(self.values),) + self.shape)
+            grown[:self.count] = self.values[:self.count]
+            self.values = grown
+        self.values[self.count:self.count + len(self.pending)] = self.pending
+        self.count += len(self.pending)
+        self.pending = []
+
+    def array(self) -> np.ndarray:
+        self.flush()
+        return self.values[:self.count]
+
+
+def read_text_project(filename: str) -> BarConstruction:
+    property_names = BarConstruction.property_names
+    sections = ("bars", "forces", "terminations")
+    bars = _RowsBuffer(len(property_names))
+    forces = _RowsBuffer()
+    terminations = {}
+    section_index = -1
+    line_number = 0
+
+    with open(filename, 'r', encoding='utf-8') as file:
+        for line_number, line in enumerate(file, 1):
+            line = line.strip()
+            if not line:
+                continue
+
+            if section_index + 1 < len(sections) and line.startswith(sections[section_index + 1]):
+                section_index += 1
+                continue
+
+            section = sections[section_index] if section_index >= 0 else None
+            if section is None:
+                raise ProjectFileError(filename, line_number, "ожидался заголовок 'bars (E, L, A, S, q):'")
+
+            if section == "bars":
+                values = line.strip('[]').split(',')
+                if len(values) != len(property_names):
+                    raise ProjectFileError(filename, line_number,
+                                           f"ожидалось {len(property_names)} параметров стержня (E, L, A, S, q), "
+                                           f"получено {len(values)}")
+                try:
+                    row = [float(value) for value in values]
+                except ValueError:
+                    raise ProjectFileError(filename, line_number,
+                                           "параметры стержня должны быть вещественными числами") from None
+                if not all(map(math.isfinite, row)):
+                    raise ProjectFileError(filename, line_number, "параметры стержня должны быть конечными числами")
+                if min(row[:-1]) <= 0:
+                    raise ProjectFileError(filename, line_number,
+                                           "параметры E, L, A и S должны быть положительными")
+                bars.append(row)
+            elif section == "forces":
+                try:
+                    force = float(line)
+                except ValueError:
+                    raise ProjectFileError(filename, line_number,
+                                           "значение нагрузки должно быть вещественным числом") from None
+                if not math.isfinite(force):
+                    raise ProjectFileError(filename, line_number, "значение нагрузки должно быть конечным числом")
+                forces.append(force)
+            else:
+                termination, _, state = line.partition(':')
+                termination, state = termination.strip(), state.strip()
+                if termination not in ("left", "right") or state not in ("True", "False"):
+                    raise ProjectFileError(filename, line_number,
+                                           "ожидалась заделка вида 'left: True' или 'right: False'")
+                if termination in terminations:
+                    raise ProjectFileError(filename, line_number, f"заделка '{termination}' указана повторно")
+                terminations[termination] = state == "True"
+
+    bars = bars.array()
+    forces = forces.array()
+    nodes_count = len(bars) + 1 if len(bars) else 0
+    if section_index + 1 < len(sections):
+        raise ProjectFileError(filename, line_number, f"отсутствует раздел '{sections[section_index + 1]}'")
+    if len(forces) != nodes_count:
+        raise ProjectFileError(filename, line_number,
+                               f"ожидалось {nodes_count} узловых нагрузок, получено {len(forces)}")
+    if len(terminations) != 2:
+        raise ProjectFileError(filename, line_number, "должны быть указаны обе заделки: left и right")
+    if not terminations["left"] and not terminations["right"]:
+        raise ProjectFileError(filename, line_number, "конструкция должна быть закреплена хотя бы с одной стороны")
+
+    columns = {name: np.ascontiguousarray(bars[:, j]) for j, name in enumerate(property_names)}
+    return BarConstruction.from_arrays(columns, forces.copy(), terminations)
+
+
+def write_text_project(construction: BarConstruction, filename: str, chunk_rows: int = 65536):
+    # Rows are formatted chunk by chunk, so memory stays bounded for any model size
+    columns = [construction.column(name) for name in BarConstruction.property_names]
+    with open(filename, 'w', encoding='utf-8') as file:
+        file.write("bars (E, L, A, S, q):")
+        for start in range(0, construction.bars_count, chunk_rows):
+            rows = (column[start:start + chunk_rows].tolist() for column in columns)
+            file.write(''.join(map("\n[{!r}, {!r}, {!r}, {!r}, {!r}]".format, *rows)))
+
+        file.write("\n\nforces (F):")
+        for start in range(0, construction.nodes_count, chunk_rows):
+            file.write(''.join(f"\n{force}" for force in construction.forces[start:start + chunk_rows].tolist()))
+
+        file.write("\n\nterminations")
+        for termination, state in construction.terminations.items():
+            file.write(f"\n{termination}: {state}")
+
+
+def read_binary_project(filename: str, mmap: bool = True) -> BarConstruction:
+    with open(filename, 'rb') as file:
+        header = file.read(binary_header.size)
+    if len(header) < binary_header.size:
+        raise ProjectFileError(filename, None, "файл слишком короткий для заголовка бинарного проекта")
+    magic, version, flags, bars_count = binary_header.unpack(header)
+    if magic != binary_magic:
+        raise ProjectFileError(filename, None, "файл не является бинарным проектом SAPR")
+    if version > binary_version:
+        raise ProjectFileError(filename, None, f"неподдерживаемая версия бинарного проекта: {version}")
+    if flags & 3 == 0:
+        raise ProjectFileError(filename, None, "конструкция должна быть закреплена хотя бы с одной стороны")
+
+    nodes_count = bars_count + 1 if bars_count else 0
+    lengths = [bars_count] * len(BarConstruction.property_names) + [nodes_count, nodes_count]
+    if os.path.getsize(filename) < binary_header.size + 8 * sum(lengths):
+        raise ProjectFileError(filename, None, "бинарный проект обрезан")
+    offset = binary_header.size
+    arrays = []
+    for length in lengths:
+        if mmap and length:
+            # Copy-on-write mapping: edits stay in memory and never touch the project file
+            arrays.append(np.memmap(filename, dtype='<f8', mode='c', offset=offset, shape=(length,)))
+        else:
+            with open(filename, 'rb') as file:
+                file.seek(offset)
+                arrays.append(np.fromfile(file, dtype='<f8', count=length))
+        offset += length * 8
+
+    columns = dict(zip(BarConstruction.property_names, arrays))
+    # The same checks as in the text format; the stored coordinates must agree with the lengths
+    for name in BarConstruction.property_names:
+        invalid = np.flatnonzero(~np.isfinite(columns[name]))
+        if len(invalid):
+            raise ProjectFileError(filename, None, f"стержень {invalid[0] + 1}: параметры стержня должны быть "
+                                                   f"конечными числами")
+    invalid = np.flatnonzero(~np.isfinite(arrays[-2]))
+    if len(invalid):
+        raise ProjectFileError(filename, None, f"узел {invalid[0] + 1}: значение нагрузки должно быть конечным числом")
+    for name in ('E', 'L', 'A', 'S'):
+        invalid = np.flatnonzero(~(columns[name] > 0))
+        if len(invalid):
+            raise ProjectFileError(filename, None, f"стержень {invalid[0] + 1}: параметры E, L, A и S должны быть "
+                                                   f"положительными")
+    coordinates = arrays[-1]
+    if bars_count and (coordinates[0] != 0 or not np.isclose(coordinates[-1], np.sum(columns['L']), rtol=1e-8)):
+        raise ProjectFileError(filename, None, "координаты узлов не согласуются с длинами стержней")
+
+    terminations = {"left": bool(flags & 1), "right": bool(flags & 2)}
+    return BarConstruction.from_arrays(columns, arrays[-2], terminations, arrays[-1])
+
+
+def write_binary_project(construction: BarConstruction, filename: str):
+    # The construction may be memory-mapped from this very file, so it is written aside and swapped in. The mapping
+    # is dropped first: a mapped file cannot be replaced on Windows.
+    flags = int(construction.terminations["left"]) | int(construction.terminations["right"]) << 1
+    temporary_filename = filename + '.tmp'
+    try:
+        with open(temporary_filename, 'wb') as file:
+            file.write(binary_header.pack(binary_magic, binary_version, flags, construction.bars_count))
+            for name in BarConstruction.property_names:
+                construction.column(name).astype('<f8', copy=False).tofile(file)
+            construction.forces.astype('<f8', copy=False).tofile(file)
+            construction.node_coordinates.astype('<f8', copy=False).tofile(file)
+        construction.unmap(filename)
+        os.replace(temporary_filename, filename)
+    except BaseException:
+        try:
+            os.remove(temporary_filename)
+        except OSError:
+            pass
+        raise
+
+if __name__ == '__main__':
+    if len(sys.argv) != 3:
+        print("usage: python ProjectFile.py SOURCE TARGET  (.sapr <-> .saprb)", file=sys.stderr)
+        sys.exit(2)
+    convert_project(sys.argv[1], sys.argv[2])
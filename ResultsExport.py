@@ -0,0 +1,51 @@
+import zipfile
+
+import numpy as np
+
+from BarConstruction import BarConstruction
+
+results_header = ["Стержень", "x", "N(x)", "U(x)", "S(x)"]
+
+
+def sample_results(construction: BarConstruction, values_count: int = 10, chunk_rows: int = 2 ** 16):
+    # Yields (rows x 5) blocks of bar number, local x, N, U and S in bar order
+    construction.compute_movements_vector()
+    bars_per_chunk = max(1, chunk_rows // (values_count + 1))
+    steps = np.arange(values_count + 1)
+    for start in range(0, construction.bars_count, bars_per_chunk):
+        n_bars = np.repeat(np.arange(start, min(start + bars_per_chunk, construction.bars_count)), values_count + 1)
+        x = np.tile(steps, len(n_bars) // (values_count + 1)) * (construction.L[n_bars] / values_count)
+        Nx, Ux, Sx = construction.compute_fields(n_bars, x)
+        yield np.column_stack((n_bars + 1, np.round(x, 4), Nx, Ux, Sx))
+
+
+def export_csv(construction: BarConstruction, filename: str, values_count: int = 10, blocks=None):
+    # One %-formatting call per block keeps the per-row cost in C; values are already rounded to 4 digits
+    row_format = "%d,%.4f,%.4f,%.4f,%.4f\n"
+    blocks = sample_results(construction, values_count) if blocks is None else blocks
+    with open(filename, 'w', encoding='utf-8') as file:
+        file.write(','.join(results_header) + '\n')
+        for block in blocks:
+            file.write((row_format * len(block)) % tuple(block.ravel().tolist()))
+
+
+def export_npz(construction: BarConstruction, filename: str, values_count: int = 10, blocks=None):
+    # The .npy entry is written block by block into the archive instead of being built in memory first
+    rows = construction.bars_count * (values_count + 1)
+    blocks = sample_results(construction, values_count) if blocks is None else blocks
+    with zipfile.ZipFile(filename, 'w', zipfile.ZIP_STORED, allowZip64=True) as archive:
+        with archive.open('results.npy', 'w', force_zip64=True) as file:
+            header = {'descr': '<f8', 'fortran_order': False, 'shape': (rows, len(results_header))}
+            np.lib.format.write_array_header_2_0(file, header)
+            for block in blocks:
+                file.write(block.astype('<f8').tobytes())
+        with archive.open('columns.npy', 'w') as file:
+            np.lib.format.write_array(file, np.array(results_header))
+
+
+def export_results(construction: BarConstruction, filename: str, values_count: int = 10, blocks=None):
+    # blocks replace the sample_results of the construction, e.g. to follow the progress of a long export
+    if filename.endswith('.npz'):
+        export_npz(construction, filename, values_count, blocks)
+    else:
+        export_csv(construction, filename, values_count, blocks)
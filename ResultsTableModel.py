@@ -0,0 +1,72 @@
+import numpy as np
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, Qt
+from PyQt5.QtGui import QBrush, QColor
+
+from Colors import Color
+from ResultsExport import results_header
+
+
+class ResultsTableModel(QAbstractTableModel):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.columns = [np.zeros(0) for _ in results_header]
+        self.allowed_stress = np.zeros(0)
+        self.order = np.zeros(0, dtype=int)
+        self.over_stress_brush = QBrush(QColor("red"))
+        self.odd_bar_brush = QBrush(QColor(*Color.light_gray))
+
+    def set_results(self, n_bars: np.ndarray, x: np.ndarray, Nx: np.ndarray, Ux: np.ndarray, Sx: np.ndarray,
+                    allowed_stress: np.ndarray):
+        self.beginResetModel()
+        self.columns = [np.asarray(n_bars) + 1, np.round(x, 4), Nx, Ux, Sx]
+        self.allowed_stress = allowed_stress
+        self.order = np.arange(len(n_bars))
+        self.endResetModel()
+
+    def clear(self):
+        self.set_results(np.zeros(0, dtype=int), np.zeros(0), np.zeros(0), np.zeros(0), np.zeros(0), np.zeros(0))
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.order)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(results_header)
+
+    def rows(self, chunk_rows: int = 2 ** 16):
+        # Rows in display order, converted to Python values block by block
+        for start in range(0, len(self.order), chunk_rows):
+            order = self.order[start:start + chunk_rows]
+            yield from zip(*(column[order].tolist() for column in self.columns))
+
+    def data(self, index: QModelIndex, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self.order[index.row()]
+        col = index.column()
+        if role == Qt.DisplayRole:
+            return str(self.columns[col][row].item())
+        if role == Qt.TextAlignmentRole:
+            return Qt.AlignCenter
+        if role == Qt.ForegroundRole and col == len(results_header) - 1:
+            if abs(self.columns[col][row]) >= self.allowed_stress[row]:
+                return self.over_stress_brush
+        if role == Qt.BackgroundRole and self.columns[0][row] % 2 == 1:
+            return self.odd_bar_brush
+        return None
+
+    def headerData(self, section: int, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return results_header[section]
+        return str(section + 1)
+
+    def sort(self, column: int, order=Qt.AscendingOrder):
+        self.layoutAboutToBeChanged.emit()
+        if column < 0:
+            self.order = np.arange(len(self.order))
+        else:
+            self.order = np.argsort(self.columns[column], kind='stable')
+            if order == Qt.DescendingOrder:
+                self.order = self.order[::-1]
+        self.layoutChanged.emit()
@@ -0,0 +1,126 @@
+import os
+
+import numpy as np
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from BarConstruction import BarConstruction
+from Instrumentation import instrumentation
+from ResultsExport import export_results, sample_results
+
+
+class SolverWorker(QThread):
+    # Solves and samples a copy of the construction, so the GUI thread may keep editing the original.
+    # Everything that was asked for is posted back in one results_ready signal; an interrupted worker posts nothing.
+    progress = pyqtSignal(int)
+    results_ready = pyqtSignal(object, dict)
+    error_occurred = pyqtSignal(str)
+    chunk_size = 2 ** 18
+
+    def __init__(self, construction: BarConstruction, tasks: tuple, parent=None, sections: np.ndarray = None,
+                 export: tuple = None):
+        super().__init__(parent)
+        self.construction = construction.copy()
+        self.tasks = tasks
+        self.sections = sections
+        # (filename, values_count) of the 'export' task
+        self.export = export
+        self.done = 0
+        self.total = 1
+        self.percent = 0
+
+    def positions(self) -> dict:
+        # Extremes and the adaptive epure sampling depend on the solution, so these are taken after solving
+        construction = self.construction
+        positions = {}
+        if 'epures' in self.tasks:
+            positions['epure_ends'] = construction.end_positions()
+            positions['epure_points'] = construction.epure_positions()
+        if 'discrete_values' in self.tasks:
+            positions['discrete_values'] = construction.discrete_positions()
+        if 'extreme_values' in self.tasks:
+            positions['extreme_values'] = construction.extreme_positions()
+        if 'sections' in self.tasks:
+            positions['sections'] = construction.results.locate(self.sections)
+        return positions
+
+    def run(self):
+        try:
+            results = self.compute()
+        except Exception as error:
+            self.error_occurred.emit(str(error))
+            return
+        if results is not None and not self.isInterruptionRequested():
+            self.results_ready.emit(self.construction, results)
+
+    def compute(self) -> dict:
+        solve_cost = 0 if self.construction.computed else self.construction.nodes_count
+        self.construction.compute_movements_vector()
+        if self.isInterruptionRequested():
+            return None
+
+        results = {}
+        export_rows = self.construction.bars_count * (self.export[1] + 1) if 'export' in self.tasks else 0
+        with instrumentation.timer("sampling"):
+            positions = self.positions()
+            self.total = max(solve_cost + sum(len(x) for _, x in positions.values()) + export_rows, 1)
+            self.advance(solve_cost)
+            for name, (n_bars, x) in positions.items():
+                fields = self.sample(n_bars, x)
+                if fields is None:
+                    return None
+                results[name] = (n_bars, x) + fields
+                instrumentation.count("sampled_points", len(x))
+        if 'export' in self.tasks:
+            with instrumentation.timer("export"):
+                if not self.write_export():
+                    return None
+            instrumentation.count("exported_rows", export_rows)
+            results['export'] = self.export[0]
+        return results
+
+    def write_export(self) -> bool:
+        # An interrupted or failed export removes its file, so no truncated results are left behind
+        filename, values_count = self.export
+        try:
+            export_results(self.construction, filename, values_count,
+                           self.tracked(sample_results(self.construction, values_count)))
+        except Exception:
+            self.remove(filename)
+            raise
+        if self.isInterruptionRequested():
+            self.remove(filename)
+            return False
+        return True
+
+    def tracked(self, blocks):
+        for block in blocks:
+            if self.isInterruptionRequested():
+                return
+            yield block
+            self.advance(len(block))
+
+    @staticmethod
+    def remove(filename: str):
+        try:
+            os.remove(filename)
+        except OSError:
+            pass
+
+    def sample(self, n_bars: np.ndarray, x: np.ndarray) -> tuple:
+        # Chunks keep the progress moving and let an interruption stop the worker between them
+        fields = tuple(np.empty(len(x)) for _ in range(3))
+        for start in range(0, len(x), self.chunk_size):
+            if self.isInterruptionRequested():
+                return None
+            chunk = slice(start, start + self.chunk_size)
+            for values, chunk_values in zip(fields, self.construction.compute_fields(n_bars[chunk], x[chunk])):
+                values[chunk] = chunk_values
+            self.advance(min(self.chunk_size, len(x) - start))
+        return fields
+
+    def advance(self, count: int):
+        self.done += count
+        percent = 100 * self.done // self.total
+        if percent != self.percent:
+            self.percent = percent
+            self.progress.emit(percent)
@@ -0,0 +1,59 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+project_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Each snippet runs in a fresh interpreter, so module caches of the benchmark itself do not interfere
+snippets = {
+    "core": "import BarConstruction, ProjectFile",
+    "batch": "import BatchSolver",
+    "gui_module": "import SAPR",
+    "gui_window": "from PyQt5.QtWidgets import QApplication\n"
+                  "application = QApplication([])\n"
+                  "import SAPR\n"
+                  "window = SAPR.MainWindow()",
+}
+
+probe = """
+import sys, time
+start = time.perf_counter()
+{snippet}
+elapsed = time.perf_counter() - start
+heavy = sorted({{name.split('.')[0] for name in sys.modules if name.split('.')[0] in ('PyQt5', 'matplotlib')}})
+print(elapsed, ','.join(heavy))
+"""
+
+
+def measure(snippet: str, repeat: int) -> dict:
+    environment = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    timings = []
+    heavy = ""
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, "-c", probe.format(snippet=snippet)], cwd=project_dir,
+                                env=environment, capture_output=True, text=True, check=True).stdout.split()
+        timings.append(float(output[0]))
+        heavy = output[1] if len(output) > 1 else ""
+    return {"best": min(timings), "median": sorted(timings)[len(timings) // 2], "heavy_imports": heavy}
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description="Measure cold import and startup time of SAPR modules")
+    parser.add_argument('-r', '--repeat', type=int, default=5)
+    parser.add_argument('--json', action='store_true', help="print the results as JSON")
+    args = parser.parse_args(argv)
+
+    results = {name: measure(snippet, args.repeat) for name, snippet in snippets.items()}
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for name, result in results.items():
+            print(f"{name:<12} best {result['best'] * 1000:8.1f} ms   median {result['median'] * 1000:8.1f} ms   "
+                  f"{result['heavy_imports'] or '-'}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
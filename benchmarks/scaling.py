@@ -0,0 +1,305 @@
+import argparse
+import json
+import math
+import os
+import platform
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+project_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_dir)
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from BarConstruction import BarConstruction
+from ProjectFile import read_project, write_project
+from ResultsExport import export_csv
+
+default_sizes = (10, 1000, 100000, 1000000)
+# Differences below this many seconds are timer and scheduler noise, never a regression
+noise_seconds = 0.002
+application = None
+
+
+def generate_construction(bars_count: int, seed: int = 0) -> BarConstruction:
+    generator = np.random.default_rng(seed)
+    columns = {
+        'E': generator.uniform(1, 3, bars_count),
+        'L': generator.uniform(0.5, 2, bars_count),
+        'A': generator.uniform(1, 2, bars_count),
+        'S': generator.uniform(1, 10, bars_count),
+        'q': generator.normal(0, 1, bars_count) * (generator.random(bars_count) < 0.5),
+    }
+    forces = generator.normal(0, 1, bars_count + 1)
+    return BarConstruction.from_arrays(columns, forces, {"left": True, "right": True})
+
+
+def solved(state: dict) -> BarConstruction:
+    construction = state['construction']
+    construction.compute_movements_vector()
+    return construction
+
+
+def window(state: dict):
+    # One main window per size, holding the generated construction like an opened project
+    global application
+    if 'window' not in state:
+        from PyQt5.QtWidgets import QApplication
+        import SAPR
+        application = QApplication.instance() or QApplication([])
+        main_window = SAPR.MainWindow()
+        construction = solved(state)
+        main_window.bar_construction = construction
+        main_window.bars_model.set_construction(construction)
+        main_window.forces_model.set_construction(construction)
+        main_window.canvas.rebuild(construction)
+        state['window'] = main_window
+    return state['window']
+
+
+def solve_case(state: dict):
+    # Assembly, factorization and solve from scratch on every run
+    construction = state['construction']
+    columns = {name: construction.column(name) for name in BarConstruction.property_names}
+
+    def run():
+        BarConstruction.from_arrays(columns, construction.forces, construction.terminations,
+                                    construction.node_coordinates).compute_movements_vector()
+    return run
+
+
+def resolve_case(state: dict):
+    # A load change solved against the cached factorization
+    construction = solved(state)
+
+    def run():
+        construction.change_force(1, construction.forces[0] + 1)
+        construction.compute_movements_vector()
+    return run
+
+
+def sample_case(state: dict):
+    construction = solved(state)
+    n_bars, x = construction.discrete_positions()
+    return lambda: construction.compute_fields(n_bars, x)
+
+
+def extremes_case(state: dict):
+    construction = solved(state)
+    return construction.extreme_positions
+
+
+def epure_positions_case(state: dict):
+    construction = solved(state)
+    return construction.epure_positions
+
+
+def project_case(extension: str, action: str):
+    def case(state: dict):
+        filename = os.path.join(state['directory'], f"construction{extension}")
+        if action == 'save':
+            return lambda: write_project(state['construction'], filename)
+        write_project(state['construction'], filename)
+        return lambda: read_project(filename, mmap=False)
+    return case
+
+
+def export_csv_case(state: dict):
+    construction = solved(state)
+    filename = os.path.join(state['directory'], "results.csv")
+    return lambda: export_csv(construction, filename)
+
+
+def scene_rebuild_case(state: dict):
+    main_window = window(state)
+    return lambda: main_window.canvas.rebuild(main_window.bar_construction)
+
+
+def scene_render_case(state: dict):
+    # Painting the whole construction fitted into the view
+    main_window = window(state)
+    view = main_window.figure_view
+    view.resize(1200, 300)
+    view.fitInView(main_window.canvas.itemsBoundingRect())
+    view.refresh_detail()
+    return view.viewport().grab
+
+
+def redraw_terminations_case(state: dict):
+    return window(state).canvas.redraw_terminations
+
+
+def bar_edit_case(state: dict):
+    # Editing E of the middle bar through the table model, which also updates the scene and the factorization
+    main_window = window(state)
+    row = main_window.bar_construction.bars_count // 2
+    index = main_window.bars_model.index(row, 0)
+    values = [str(main_window.bar_construction.E[row]), str(main_window.bar_construction.E[row] * 2)]
+
+    def run():
+        values.reverse()
+        main_window.bars_model.setData(index, values[0])
+    return run
+
+
+def fill_table_case(state: dict):
+    main_window = window(state)
+    values = main_window.bar_construction.discrete_values()
+    return lambda: main_window.fill_computations_table(*values)
+
+
+def draw_epures_case(state: dict):
+    # Updating all three epures on the shown results tab, including the deferred render of the visible one
+    from SolverWorker import SolverWorker
+    main_window = window(state)
+    if main_window.Nx_epure is None:
+        main_window.set_epures_options()
+    main_window.tab_widget_main.setTabEnabled(1, True)
+    main_window.tab_widget_main.setCurrentIndex(1)
+    main_window.postprocessor_tab_widget.setCurrentWidget(main_window.epures_tab)
+    main_window.show()
+    results = SolverWorker(main_window.bar_construction, ('epures',)).compute()
+
+    def run():
+        main_window.draw_epures(results['epure_ends'], results['epure_points'])
+        application.processEvents()
+    return run
+
+
+cases = {
+    "solve": solve_case,
+    "resolve_loads": resolve_case,
+    "sample_fields": sample_case,
+    "extreme_positions": extremes_case,
+    "epure_positions": epure_positions_case,
+    "save_sapr": project_case('.sapr', 'save'),
+    "open_sapr": project_case('.sapr', 'open'),
+    "save_saprb": project_case('.saprb', 'save'),
+    "open_saprb": project_case('.saprb', 'open'),
+    "export_csv": export_csv_case,
+}
+gui_cases = {
+    "scene_rebuild": scene_rebuild_case,
+    "scene_render": scene_render_case,
+    "redraw_terminations": redraw_terminations_case,
+    "bar_edit": bar_edit_case,
+    "fill_table": fill_table_case,
+    "draw_epures": draw_epures_case,
+}
+
+
+def measure(run, repeat: int, budget: float) -> float:
+    # Best of up to repeat runs; slow cases stop repeating once they have used up the time budget
+    timings = []
+    while len(timings) < repeat and sum(timings) < budget:
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def run_benchmarks(names: list, sizes: list, repeat: int, budget: float) -> dict:
+    all_cases = dict(cases, **gui_cases)
+    results = {name: {} for name in names}
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            state = {'construction': generate_construction(size), 'directory': directory}
+            for name in names:
+                results[name][str(size)] = measure(all_cases[name](state), repeat, budget)
+                print(f"{name:<20} {size:>8} bars {results[name][str(size)] * 1000:10.2f} ms", file=sys.stderr)
+            if 'window' in state:
+                state['window'].close()
+    return results
+
+
+def scaling_exponent(timings: dict) -> float:
+    # Slope of log(time) over log(bars) between the two largest sizes; 1 means linear scaling
+    sizes = sorted(timings, key=int)
+    if len(sizes) < 2:
+        return None
+    small, large = sizes[-2], sizes[-1]
+    if timings[small] <= 0 or timings[large] <= 0:
+        return None
+    return math.log(timings[large] / timings[small]) / math.log(int(large) / int(small))
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    regressions = []
+    for name, timings in results.items():
+        for size, seconds in timings.items():
+            reference = baseline.get(name, {}).get(size)
+            if reference is not None and seconds > reference * (1 + tolerance) and seconds - reference > noise_seconds:
+                regressions.append({"case": name, "bars": int(size), "baseline": reference, "current": seconds,
+                                    "ratio": seconds / reference})
+    return regressions
+
+
+def print_table(results: dict, baseline: dict, regressions: list):
+    sizes = sorted({size for timings in results.values() for size in timings}, key=int)
+    flagged = {(regression['case'], str(regression['bars'])) for regression in regressions}
+    print(f"{'case':<20}" + ''.join(f"{size + ' bars':>20}" for size in sizes) + f"{'exponent':>10}")
+    for name, timings in results.items():
+        cells = []
+        for size in sizes:
+            if size not in timings:
+                cells.append(f"{'-':>20}")
+                continue
+            cell = f"{timings[size] * 1000:.2f} ms"
+            reference = baseline.get(name, {}).get(size)
+            if reference:
+                cell += f" x{timings[size] / reference:.2f}"
+            cell += " !" if (name, size) in flagged else "  "
+            cells.append(f"{cell:>20}")
+        exponent = scaling_exponent(timings)
+        print(f"{name:<20}" + ''.join(cells) + (f"{exponent:10.2f}" if exponent is not None else f"{'-':>10}"))
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description="Measure how solving, evaluation, file I/O and redraws scale with "
+                                                 "the number of bars")
+    parser.add_argument('-s', '--sizes', type=int, nargs='+', default=list(default_sizes))
+    parser.add_argument('-c', '--cases', nargs='+', choices=list(cases) + list(gui_cases),
+                        help="cases to run (default: all)")
+    parser.add_argument('--no-gui', action='store_true', help="skip the cases that need Qt and matplotlib")
+    parser.add_argument('-r', '--repeat', type=int, default=5)
+    parser.add_argument('-b', '--budget', type=float, default=2.0,
+                        help="seconds after which a case stops repeating")
+    parser.add_argument('-o', '--output', help="write the results as JSON to this file")
+    parser.add_argument('--compare', metavar='BASELINE',
+                        help="JSON results to flag regressions against, e.g. benchmarks/scaling_baseline.json")
+    parser.add_argument('-t', '--tolerance', type=float, default=0.25,
+                        help="allowed slowdown relative to the baseline (default: 0.25)")
+    args = parser.parse_args(argv)
+
+    names = args.cases or list(cases) + ([] if args.no_gui else list(gui_cases))
+    results = run_benchmarks(names, args.sizes, args.repeat, args.budget)
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as file:
+            baseline = json.load(file)['results']
+    regressions = compare(results, baseline, args.tolerance)
+
+    if args.output:
+        report = {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "results": results,
+            "scaling": {name: scaling_exponent(timings) for name, timings in results.items()},
+            "regressions": regressions,
+        }
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=2)
+
+    print_table(results, baseline, regressions)
+    for regression in regressions:
+        print(f"Regression: {regression['case']} with {regression['bars']} bars is {regression['ratio']:.2f} times "
+              f"slower than the baseline", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
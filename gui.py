@@ -38,7 +38,7 @@ class Ui_MainWindow(object):
         self.add_bar_btn.setFont(font)
         self.add_bar_btn.setObjectName("add_bar_btn")
         self.preprocessor_layout.addWidget(self.add_bar_btn, 2, 0, 1, 1)
-        self.figure_view = QtWidgets.QGraphicsView(self.preprocessor_tab)
+        self.figure_view = ConstructionView(self.preprocessor_tab)
         self.figure_view.setObjectName("figure_view")
         self.preprocessor_layout.addWidget(self.figure_view, 3, 0, 1, 3)
         self.add_force_btn = QtWidgets.QPushButton(self.preprocessor_tab)
@@ -59,19 +59,8 @@ class Ui_MainWindow(object):
         font.setPointSize(12)
         self.forces_table.setFont(font)
         self.forces_table.setAlternatingRowColors(False)
+        self.forces_table.setSortingEnabled(False)
         self.forces_table.setObjectName("forces_table")
-        self.forces_table.setColumnCount(2)
-        self.forces_table.setRowCount(1)
-        item = QtWidgets.QTableWidgetItem()
-        self.forces_table.setVerticalHeaderItem(0, item)
-        item = QtWidgets.QTableWidgetItem()
-        self.forces_table.setHorizontalHeaderItem(0, item)
-        item = QtWidgets.QTableWidgetItem()
-        self.forces_table.setHorizontalHeaderItem(1, item)
-        item = QtWidgets.QTableWidgetItem()
-        self.forces_table.setItem(0, 0, item)
-        item = QtWidgets.QTableWidgetItem()
-        self.forces_table.setItem(0, 1, item)
         self.forces_table.horizontalHeader().setCascadingSectionResizes(False)
         self.forces_table.horizontalHeader().setStretchLastSection(True)
         self.preprocessor_layout.addWidget(self.forces_table, 1, 2, 1, 1)
@@ -92,7 +81,7 @@ class Ui_MainWindow(object):
         self.del_bar_btn.setFont(font)
         self.del_bar_btn.setObjectName("del_bar_btn")
         self.preprocessor_layout.addWidget(self.del_bar_btn, 2, 1, 1, 1)
-        self.bars_table = QtWidgets.QTableWidget(self.preprocessor_tab)
+        self.bars_table = QtWidgets.QTableView(self.preprocessor_tab)
         sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Expanding)
         sizePolicy.setHorizontalStretch(0)
         sizePolicy.setVerticalStretch(0)
@@ -106,34 +95,8 @@ class Ui_MainWindow(object):
         self.bars_table.setSizeAdjustPolicy(QtWidgets.QAbstractScrollArea.AdjustIgnored)
         self.bars_table.setAutoScroll(True)
         self.bars_table.setGridStyle(QtCore.Qt.SolidLine)
+        self.bars_table.setSortingEnabled(False)
         self.bars_table.setObjectName("bars_table")
-        self.bars_table.setColumnCount(5)
-        self.bars_table.setRowCount(1)
-        item = QtWidgets.QTableWidgetItem()
-        self.bars_table.setVerticalHeaderItem(0, item)
-        item = QtWidgets.QTableWidgetItem()
-        self.bars_table.setHorizontalHeaderItem(0, item)
-        item = QtWidgets.QTableWidgetItem()
-        self.bars_table.setHorizontalHeaderItem(1, item)
-        item = QtWidgets.QTableWidgetItem()
-        self.bars_table.setHorizontalHeaderItem(2, item)
-        item = QtWidgets.QTableWidgetItem()
-        self.bars_table.setHorizontalHeaderItem(3, item)
-        item = QtWidgets.QTableWidgetItem()
-        self.bars_table.setHorizontalHeaderItem(4, item)
-        item = QtWidgets.QTableWidgetItem()
-        brush = QtGui.QBrush(QtGui.QColor(0, 0, 0))
-        brush.setStyle(QtCore.Qt.NoBrush)
-        item.setBackground(brush)
-        self.bars_table.setItem(0, 0, item)
-        item = QtWidgets.QTableWidgetItem()
-        self.bars_table.setItem(0, 1, item)
-        item = QtWidgets.QTableWidgetItem()
-        self.bars_table.setItem(0, 2, item)
-        item = QtWidgets.QTableWidgetItem()
-        self.bars_table.setItem(0, 3, item)
-        item = QtWidgets.QTableWidgetItem()
-        self.bars_table.setItem(0, 4, item)
         self.bars_table.horizontalHeader().setDefaultSectionSize(130)
         self.bars_table.horizontalHeader().setStretchLastSection(True)
         self.preprocessor_layout.addWidget(self.bars_table, 1, 0, 1, 2)
@@ -192,26 +155,15 @@ class Ui_MainWindow(object):
         self.computations_tab.setObjectName("computations_tab")
         self.gridLayout_7 = QtWidgets.QGridLayout(self.computations_tab)
         self.gridLayout_7.setObjectName("gridLayout_7")
-        self.computations_table = QtWidgets.QTableWidget(self.computations_tab)
+        self.computations_table = QtWidgets.QTableView(self.computations_tab)
         self.computations_table.setEnabled(True)
         font = QtGui.QFont()
         font.setFamily("Times New Roman")
         font.setPointSize(14)
         self.computations_table.setFont(font)
         self.computations_table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.computations_table.setSortingEnabled(True)
         self.computations_table.setObjectName("computations_table")
-        self.computations_table.setColumnCount(5)
-        self.computations_table.setRowCount(0)
-        item = QtWidgets.QTableWidgetItem()
-        self.computations_table.setHorizontalHeaderItem(0, item)
-        item = QtWidgets.QTableWidgetItem()
-        self.computations_table.setHorizontalHeaderItem(1, item)
-        item = QtWidgets.QTableWidgetItem()
-        self.computations_table.setHorizontalHeaderItem(2, item)
-        item = QtWidgets.QTableWidgetItem()
-        self.computations_table.setHorizontalHeaderItem(3, item)
-        item = QtWidgets.QTableWidgetItem()
-        self.computations_table.setHorizontalHeaderItem(4, item)
         self.computations_table.horizontalHeader().setDefaultSectionSize(205)
         self.computations_table.horizontalHeader().setStretchLastSection(True)
         self.gridLayout_7.addWidget(self.computations_table, 3, 0, 1, 5)
@@ -343,14 +295,23 @@ class Ui_MainWindow(object):
         self.action_3.setObjectName("action_3")
         self.compute_action = QtWidgets.QAction(MainWindow)
         self.compute_action.setObjectName("compute_action")
+        self.profile_action = QtWidgets.QAction(MainWindow)
+        self.profile_action.setCheckable(True)
+        self.profile_action.setObjectName("profile_action")
         self.save_table_action = QtWidgets.QAction(MainWindow)
         self.save_table_action.setEnabled(False)
         self.save_table_action.setObjectName("save_table_action")
+        self.export_results_action = QtWidgets.QAction(MainWindow)
+        self.export_results_action.setEnabled(False)
+        self.export_results_action.setObjectName("export_results_action")
         self.file_menu.addAction(self.open_action)
         self.file_menu.addAction(self.save_action)
         self.file_menu.addSeparator()
         self.file_menu.addAction(self.save_table_action)
+        self.file_menu.addAction(self.export_results_action)
         self.processor_menu.addAction(self.compute_action)
+        self.processor_menu.addSeparator()
+        self.processor_menu.addAction(self.profile_action)
         self.menubar.addAction(self.file_menu.menuAction())
         self.menubar.addAction(self.processor_menu.menuAction())
 
@@ -365,66 +326,15 @@ class Ui_MainWindow(object):
         MainWindow.setWindowTitle(_translate("MainWindow", "SAPR"))
         self.add_bar_btn.setText(_translate("MainWindow", "Добавить стержень"))
         self.add_force_btn.setText(_translate("MainWindow", "Добавить нагрузку"))
-        self.forces_table.setSortingEnabled(False)
-        item = self.forces_table.verticalHeaderItem(0)
-        item.setText(_translate("MainWindow", "1"))
-        item = self.forces_table.horizontalHeaderItem(0)
-        item.setText(_translate("MainWindow", "Номер узла"))
-        item = self.forces_table.horizontalHeaderItem(1)
-        item.setText(_translate("MainWindow", "F"))
-        __sortingEnabled = self.forces_table.isSortingEnabled()
-        self.forces_table.setSortingEnabled(False)
-        item = self.forces_table.item(0, 0)
-        item.setText(_translate("MainWindow", "-"))
-        item = self.forces_table.item(0, 1)
-        item.setText(_translate("MainWindow", "-"))
-        self.forces_table.setSortingEnabled(__sortingEnabled)
         self.bar_nodal_loads.setText(_translate("MainWindow", "Узловые нагрузки"))
         self.del_bar_btn.setText(_translate("MainWindow", "Удалить последний стержень"))
-        self.bars_table.setSortingEnabled(False)
-        item = self.bars_table.verticalHeaderItem(0)
-        item.setText(_translate("MainWindow", "1"))
-        item = self.bars_table.horizontalHeaderItem(0)
-        item.setText(_translate("MainWindow", "E"))
-        item = self.bars_table.horizontalHeaderItem(1)
-        item.setText(_translate("MainWindow", "L"))
-        item = self.bars_table.horizontalHeaderItem(2)
-        item.setText(_translate("MainWindow", "A"))
-        item = self.bars_table.horizontalHeaderItem(3)
-        item.setText(_translate("MainWindow", "S"))
-        item = self.bars_table.horizontalHeaderItem(4)
-        item.setText(_translate("MainWindow", "q"))
-        __sortingEnabled = self.bars_table.isSortingEnabled()
-        self.bars_table.setSortingEnabled(False)
-        item = self.bars_table.item(0, 0)
-        item.setText(_translate("MainWindow", "1"))
-        item = self.bars_table.item(0, 1)
-        item.setText(_translate("MainWindow", "1"))
-        item = self.bars_table.item(0, 2)
-        item.setText(_translate("MainWindow", "1"))
-        item = self.bars_table.item(0, 3)
-        item.setText(_translate("MainWindow", "1"))
-        item = self.bars_table.item(0, 4)
-        item.setText(_translate("MainWindow", "0"))
-        self.bars_table.setSortingEnabled(__sortingEnabled)
         self.bar_label.setText(_translate("MainWindow", "Стержни"))
         self.left_termination.setText(_translate("MainWindow", "Заделка слева"))
         self.both_terminations.setText(_translate("MainWindow", "Заделки с обеих сторон"))
         self.right_termination.setText(_translate("MainWindow", "Заделка справа"))
         self.tab_widget_main.setTabText(self.tab_widget_main.indexOf(self.preprocessor_tab), _translate("MainWindow", "Препроцессор"))
-        self.computations_table.setSortingEnabled(True)
-        item = self.computations_table.horizontalHeaderItem(0)
-        item.setText(_translate("MainWindow", "Стержень"))
-        item = self.computations_table.horizontalHeaderItem(1)
-        item.setText(_translate("MainWindow", "x"))
-        item = self.computations_table.horizontalHeaderItem(2)
-        item.setText(_translate("MainWindow", "N(x)"))
-        item = self.computations_table.horizontalHeaderItem(3)
-        item.setText(_translate("MainWindow", "U(x)"))
-        item = self.computations_table.horizontalHeaderItem(4)
-        item.setText(_translate("MainWindow", "S(x)"))
         self.discrete_values_btn.setText(_translate("MainWindow", "Дискретизированные значения"))
-        self.extreme_values_btn.setText(_translate("MainWindow", "Только краевые значения"))
+        self.extreme_values_btn.setText(_translate("MainWindow", "Экстремальные значения"))
         self.table_label.setText(_translate("MainWindow", "Отобразить в таблице"))
         self.compute_section_btn.setText(_translate("MainWindow", "Рассчитать"))
         self.section_label.setText(_translate("MainWindow", "Компоненты в точке (глобально)"))
@@ -443,5 +353,8 @@ class Ui_MainWindow(object):
         self.save_action.setText(_translate("MainWindow", "Сохранить файл проекта"))
         self.action_3.setText(_translate("MainWindow", "Сохранить как"))
         self.compute_action.setText(_translate("MainWindow", "Провести расчет"))
+        self.profile_action.setText(_translate("MainWindow", "Профилирование расчета"))
         self.save_table_action.setText(_translate("MainWindow", "Сохранить таблицу расчетов"))
+        self.export_results_action.setText(_translate("MainWindow", "Экспортировать результаты расчета"))
+from ConstructionView import ConstructionView
 from ForcesTableWidget import ForcesTableWidget
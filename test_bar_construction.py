@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from BarConstruction import BarConstruction
+
+terminations_cases = {
+    "left": {"left": True, "right": False},
+    "right": {"left": False, "right": True},
+    "both": {"left": True, "right": True},
+}
+
+
+def random_construction(terminations: dict, bars_count: int = 40, seed: int = 0) -> BarConstruction:
+    generator = np.random.default_rng(seed)
+    columns = {
+        'E': generator.uniform(1, 3, bars_count),
+        'L': generator.uniform(0.5, 2, bars_count),
+        'A': generator.uniform(1, 2, bars_count),
+        'S': generator.uniform(1, 10, bars_count),
+        'q': generator.normal(0, 1, bars_count),
+    }
+    return BarConstruction.from_arrays(columns, generator.normal(0, 1, bars_count + 1), terminations)
+
+
+def solve(construction: BarConstruction, method: str) -> np.ndarray:
+    construction.computed = False
+    construction.compute_movements_vector(method)
+    return construction.movements_vector[:, 0]
+
+
+def assert_movements_equal(actual: np.ndarray, expected: np.ndarray):
+    np.testing.assert_allclose(actual, expected, rtol=1e-9, atol=1e-12 * np.abs(expected).max())
+
+
+@pytest.mark.parametrize("terminations", terminations_cases.values(), ids=terminations_cases.keys())
+def test_banded_matches_dense(terminations):
+    construction = random_construction(terminations)
+    assert_movements_equal(solve(construction, "banded"), solve(construction, "dense"))
+
+
+@pytest.mark.parametrize("terminations", terminations_cases.values(), ids=terminations_cases.keys())
+def test_updated_factorization_matches_dense(terminations):
+    construction = random_construction(terminations)
+    solve(construction, "banded")
+    factorization = construction.factorization
+    for n_bar, name, value in ((3, 'E', 10.0), (17, 'L', 0.1), (17, 'A', 5.0), (39, 'E', 0.2)):
+        construction.change_bar_property(n_bar, name, value)
+        banded = solve(construction, "banded")
+        assert construction.factorization is factorization
+        assert_movements_equal(banded, solve(construction, "dense"))
+
+
+@pytest.mark.parametrize("terminations", terminations_cases.values(), ids=terminations_cases.keys())
+def test_load_cases_match_dense(terminations):
+    construction = random_construction(terminations)
+    generator = np.random.default_rng(1)
+    for name in ("dead", "live", "wind"):
+        construction.add_load_case(name, generator.normal(0, 1, construction.nodes_count),
+                                   generator.normal(0, 1, construction.bars_count))
+
+    movements = construction.compute_load_cases()
+    for name, case in construction.load_cases.items():
+        columns = {name: construction.column(name) for name in BarConstruction.property_names}
+        columns['q'] = case['q']
+        single_case = BarConstruction.from_arrays(columns, case['forces'], terminations)
+        assert_movements_equal(movements[name], solve(single_case, "dense"))